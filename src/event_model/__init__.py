@@ -1,5 +1,4 @@
 import collections.abc
-import copy
 import inspect
 import itertools
 import json
@@ -7,12 +6,13 @@ import os
 import sys
 import threading
 import time as ttime
-import uuid
 import warnings
 import weakref
-from collections import defaultdict, deque
-from dataclasses import dataclass
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import partial
+from random import Random
 from typing import (
     Any,
     Callable,
@@ -22,6 +22,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     Union,
@@ -133,9 +134,13 @@ class DocumentRouter:
     ----------
     emit: callable, optional
         Expected signature ``f(name, doc)``
+    weak: boolean, optional
+        True by default, in which case only a weak reference to ``emit`` is
+        held. If False, hold a strong reference and call ``emit`` directly,
+        which avoids dereferencing the weak reference for each document.
     """
 
-    def __init__(self, *, emit: Optional[Callable] = None) -> None:
+    def __init__(self, *, emit: Optional[Callable] = None, weak: bool = True) -> None:
         # Put in some extra effort to validate `emit` carefully, because if
         # this is used incorrectly the resultant errors can be confusing.
 
@@ -152,8 +157,14 @@ class DocumentRouter:
                 raise ValueError(
                     "emit must accept two positional arguments, name and doc"
                 ) from error
+            if not weak:
+                # Hold a strong reference, in the same form as the weak ones.
+                self._emit_ref = lambda: emit
+                if type(self).emit is DocumentRouter.emit:
+                    # Shadow the emit method so that it calls `emit` directly.
+                    self.emit = emit  # type: ignore[method-assign]
             # Stash a weak reference to `emit`.
-            if inspect.ismethod(emit):
+            elif inspect.ismethod(emit):
                 self._emit_ref = weakref.WeakMethod(emit)
             else:
                 self._emit_ref = weakref.ref(emit)
@@ -196,63 +207,74 @@ class DocumentRouter:
 
         Optionally validate that the result is still a valid document.
         """
-        output_doc = getattr(self, name)(doc)
+        method = getattr(self, name)
+        output_doc: Any
+        if getattr(method, "__func__", None) in _NOT_IMPLEMENTED_BY_DEFAULT:
+            # The default method only returns NotImplemented; skip the call.
+            output_doc = NotImplemented
+        else:
+            output_doc = method(doc)
 
         # If 'event' is not defined by the subclass but 'event_page' is, or
         # vice versa, use that. And the same for 'datum_page' / 'datum.
         if output_doc is NotImplemented:
-            if name == "event":
-                event_page = pack_event_page(cast(Event, doc))
-                # Subclass' implementation of event_page may return a valid
-                # EventPage or None or NotImplemented.
-                output_event_page = self.event_page(event_page)
-                output_event_page = (
-                    output_event_page if output_event_page is not None else event_page
-                )
-                if output_event_page is not NotImplemented:
-                    (output_doc,) = unpack_event_page(output_event_page)
-            elif name == "datum":
-                datum_page = pack_datum_page(cast(Datum, doc))
-                # Subclass' implementation of datum_page may return a valid
-                # DatumPage or None or NotImplemented.
-                output_datum_page = self.datum_page(datum_page)
-                output_datum_page = (
-                    output_datum_page if output_datum_page is not None else datum_page
-                )
-                if output_datum_page is not NotImplemented:
-                    (output_doc,) = unpack_datum_page(output_datum_page)
-            elif name == "event_page":
-                output_events = []
-                for event in unpack_event_page(cast(EventPage, doc)):
-                    # Subclass' implementation of event may return a valid
-                    # Event or None or NotImplemented.
-                    output_event = self.event(event)
-                    output_event = output_event if output_event is not None else event
-                    if output_event is NotImplemented:
-                        break
-                    output_events.append(output_event)
-                else:
-                    output_doc = pack_event_page(*output_events)
-            elif name == "datum_page":
-                output_datums = []
-                for datum in unpack_datum_page(cast(DatumPage, doc)):
-                    # Subclass' implementation of datum may return a valid
-                    # Datum or None or NotImplemented.
-                    output_datum = self.datum(datum)
-                    output_datum = output_datum if output_datum is not None else datum
-                    if output_datum is NotImplemented:
-                        break
-                    output_datums.append(output_datum)
-                else:
-                    output_doc = pack_datum_page(*output_datums)
+            fallback = _DISPATCH_FALLBACKS.get(name)
+            if fallback is not None:
+                output_doc = getattr(self, fallback)(doc)
         # If we still don't find an implemented method by here, then pass the
         # original document through.
         if output_doc is NotImplemented:
             output_doc = doc
         if validate:
-            schema_validators[getattr(DocumentNames, name)].validate(output_doc)
+            _VALIDATE_BY_NAME[name](output_doc)
         return (name, output_doc if output_doc is not None else doc)
 
+    def _event_via_event_page(self, doc: Event) -> Event:
+        event_page = _event_to_single_page(doc)
+        # Subclass' implementation of event_page may return a valid
+        # EventPage or None or NotImplemented.
+        output_event_page = self.event_page(event_page)
+        if output_event_page is NotImplemented:
+            return doc
+        output_event_page = (
+            output_event_page if output_event_page is not None else event_page
+        )
+        return _single_page_to_event(output_event_page)
+
+    def _datum_via_datum_page(self, doc: Datum) -> Datum:
+        datum_page = _datum_to_single_page(doc)
+        # Subclass' implementation of datum_page may return a valid
+        # DatumPage or None or NotImplemented.
+        output_datum_page = self.datum_page(datum_page)
+        if output_datum_page is NotImplemented:
+            return doc
+        output_datum_page = (
+            output_datum_page if output_datum_page is not None else datum_page
+        )
+        return _single_page_to_datum(output_datum_page)
+
+    def _event_page_via_event(self, doc: EventPage) -> EventPage:
+        output_events = []
+        for event in unpack_event_page(doc):
+            # Subclass' implementation of event may return a valid
+            # Event or None or NotImplemented.
+            output_event = self.event(event)
+            if output_event is NotImplemented:
+                return doc
+            output_events.append(output_event if output_event is not None else event)
+        return _pack_event_page(output_events)
+
+    def _datum_page_via_datum(self, doc: DatumPage) -> DatumPage:
+        output_datums = []
+        for datum in unpack_datum_page(doc):
+            # Subclass' implementation of datum may return a valid
+            # Datum or None or NotImplemented.
+            output_datum = self.datum(datum)
+            if output_datum is NotImplemented:
+                return doc
+            output_datums.append(output_datum if output_datum is not None else datum)
+        return _pack_datum_page(output_datums)
+
     # The methods below return NotImplemented, a built-in Python constant.
     # Note that it is not interchangeable with NotImplementedError. See docs at
     # https://docs.python.org/3/library/constants.html#NotImplemented
@@ -311,6 +333,35 @@ class DocumentRouter:
         self.datum_page(bulk_datum_to_datum_page(doc))
 
 
+# Maps each document name to the DocumentRouter method that handles it in
+# terms of its counterpart, for use when the subclass does not implement it.
+_DISPATCH_FALLBACKS: Dict[str, str] = {
+    "event": "_event_via_event_page",
+    "datum": "_datum_via_datum_page",
+    "event_page": "_event_page_via_event",
+    "datum_page": "_datum_page_via_datum",
+}
+
+
+# The functions of the DocumentRouter methods whose default implementation
+# returns NotImplemented, so that _dispatch can recognize and skip them.
+_NOT_IMPLEMENTED_BY_DEFAULT = frozenset(
+    vars(DocumentRouter)[name]
+    for name in (
+        "start",
+        "stop",
+        "descriptor",
+        "resource",
+        "event",
+        "datum",
+        "event_page",
+        "datum_page",
+        "stream_datum",
+        "stream_resource",
+    )
+)
+
+
 class SingleRunDocumentRouter(DocumentRouter):
     """
     A DocumentRouter intended to process events from exactly one run.
@@ -319,6 +370,7 @@ class SingleRunDocumentRouter(DocumentRouter):
     def __init__(self) -> None:
         super().__init__()
         self._start_doc: Optional[dict] = None
+        self._start_uid: Optional[str] = None
         self._descriptors: dict = {}
 
     def __call__(
@@ -347,22 +399,23 @@ class SingleRunDocumentRouter(DocumentRouter):
         if name == "start":
             if self._start_doc is None:
                 self._start_doc = doc
+                self._start_uid = doc["uid"]
             else:
                 raise EventModelValueError(
                     "SingleRunDocumentRouter associated with start document "
-                    f'{self._start_doc["uid"]} '
-                    f'received a second start document with uid {doc["uid"]}'
+                    f"{self._start_doc['uid']} "
+                    f"received a second start document with uid {doc['uid']}"
                 )
         elif name == "descriptor":
             assert isinstance(self._start_doc, dict)
-            if doc["run_start"] == self._start_doc["uid"]:
+            if doc["run_start"] == self._start_uid:
                 self._descriptors[doc["uid"]] = doc
             else:
                 raise EventModelValueError(
                     "SingleRunDocumentRouter associated with start document "
-                    f'{self._start_doc["uid"]} '
-                    f'received a descriptor {doc["uid"]} associated with '
-                    f'start document {doc["run_start"]}'
+                    f"{self._start_doc['uid']} "
+                    f"received a descriptor {doc['uid']} associated with "
+                    f"start document {doc['run_start']}"
                 )
         # Defer to superclass for dispatch/processing.
         return super().__call__(name, doc, validate=validate)
@@ -403,7 +456,7 @@ class SingleRunDocumentRouter(DocumentRouter):
         elif doc["descriptor"] not in self._descriptors:
             raise EventModelValueError(
                 "SingleRunDocumentRouter has not processed a descriptor with "
-                f'uid {doc["descriptor"]}'
+                f"uid {doc['descriptor']}"
             )
 
         return self._descriptors[doc["descriptor"]]
@@ -425,6 +478,8 @@ class SingleRunDocumentRouter(DocumentRouter):
 
 
 class HandlerRegistryView(collections.abc.Mapping):
+    __slots__ = ("_handler_registry",)
+
     def __init__(self, handler_registry: dict) -> None:
         self._handler_registry = handler_registry
 
@@ -434,12 +489,21 @@ class HandlerRegistryView(collections.abc.Mapping):
     def __getitem__(self, key: str) -> str:
         return self._handler_registry[key]
 
-    def __iter__(self) -> Generator:
-        yield from self._handler_registry
+    def __iter__(self) -> Iterator:
+        return iter(self._handler_registry)
 
     def __len__(self) -> int:
         return len(self._handler_registry)
 
+    # Delegate these to the dict directly rather than using the generic
+    # Mapping implementations, which go through __getitem__ and catch KeyError.
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._handler_registry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._handler_registry.get(key, default)
+
     def __setitem__(self, key: str, val: Any) -> None:
         raise EventModelTypeError(
             "The handler registry cannot be edited directly. "
@@ -741,6 +805,9 @@ class Filler(DocumentRouter):
         self._descriptor_cache = descriptor_cache
         self._stream_resource_cache = stream_resource_cache
         self._stream_datum_cache = stream_datum_cache
+        # The external data keys of each descriptor, keyed by descriptor uid,
+        # stored with the descriptor they were computed from.
+        self._external_keys: Dict[str, Tuple[EventDescriptor, frozenset]] = {}
         if retry_intervals is None:
             retry_intervals = []
         self.retry_intervals = retry_intervals
@@ -802,6 +869,7 @@ class Filler(DocumentRouter):
         self._descriptor_cache = d["descriptor_cache"]
         self._stream_resource_cache = d["stream_resource_cache"]
         self._stream_datum_cache = d["stream_datum_cache"]
+        self._external_keys = {}
         retry_intervals = d["retry_intervals"]
         if retry_intervals is None:
             retry_intervals = []
@@ -953,10 +1021,11 @@ class Filler(DocumentRouter):
         handler = self._handler_registry.pop(spec, None)
         if handler is not None:
             self._unpatched_handler_registry.pop(spec)
-            for key in list(self._handler_cache):
-                resource_uid, spec_ = key
-                if spec == spec_:
-                    del self._handler_cache[key]
+            # Collect only the matching keys, rather than a copy of them all,
+            # before deleting from the cache.
+            stale_keys = [key for key in self._handler_cache if key[1] == spec]
+            for key in stale_keys:
+                del self._handler_cache[key]
         return handler
 
     def resource(self, doc: Resource) -> Resource:
@@ -969,9 +1038,24 @@ class Filler(DocumentRouter):
     # documents.
 
     def datum_page(self, doc: DatumPage) -> DatumPage:
-        datum = self.datum  # Avoid attribute lookup in hot loop.
-        for datum_doc in unpack_datum_page(doc):
-            datum(datum_doc)
+        if type(self).datum is not Filler.datum:
+            # A subclass customizes datum, so pass it each Datum in turn.
+            datum = self.datum  # Avoid attribute lookup in hot loop.
+            for datum_doc in unpack_datum_page(doc):
+                datum(datum_doc)
+            return doc
+        # Cache the rows directly, without going through unpack_datum_page
+        # and a method call per Datum.
+        resource = doc["resource"]
+        datum_cache = self._datum_cache
+        for datum_id, datum_kwargs in zip(
+            doc["datum_id"], _iter_rows(doc["datum_kwargs"])
+        ):
+            datum_cache[datum_id] = {
+                "datum_id": datum_id,
+                "datum_kwargs": datum_kwargs,
+                "resource": resource,
+            }
         return doc
 
     def datum(self, doc: Datum) -> Datum:
@@ -987,10 +1071,6 @@ class Filler(DocumentRouter):
         return doc
 
     def event_page(self, doc: EventPage) -> EventPage:
-        # TODO We may be able to fill a page in place, and that may be more
-        # efficient than unpacking the page in to Events, filling them, and the
-        # re-packing a new page. But that seems tricky in general since the
-        # page may be implemented as a DataFrame or dict, etc.
         filled_doc = self.fill_event_page(
             doc, include=self.include, exclude=self.exclude
         )
@@ -1007,22 +1087,133 @@ class Filler(DocumentRouter):
         exclude: Optional[Iterable] = None,
         inplace: Optional[bool] = None,
     ) -> EventPage:
-        filled_events = []
-        for event_doc in unpack_event_page(doc):
-            filled_events.append(
-                self.fill_event(
-                    event_doc, include=include, exclude=exclude, inplace=True
-                )
-            )
-        filled_doc = pack_event_page(*filled_events)
         if inplace is None:
             inplace = self._inplace
+        if type(self).fill_event is not Filler.fill_event:
+            # A subclass customizes fill_event, so fill Event by Event through
+            # it rather than working on the page's columns directly.
+            filled_events = []
+            for event_doc in unpack_event_page(doc):
+                filled_events.append(
+                    self.fill_event(
+                        event_doc, include=include, exclude=exclude, inplace=True
+                    )
+                )
+            filled_doc = _pack_event_page(filled_events)
+            if inplace:
+                doc["data"] = filled_doc["data"]
+                doc["filled"] = filled_doc["filled"]
+                return doc
+            else:
+                return filled_doc
         if inplace:
-            doc["data"] = filled_doc["data"]
-            doc["filled"] = filled_doc["filled"]
+            data = dict(doc["data"])
+            filled = dict(doc.get("filled", {}))
+            self._fill_event_page_columns(doc, data, filled, include, exclude)
+            doc["data"] = data
+            doc["filled"] = filled
             return doc
         else:
-            return filled_doc
+            # Copy every column so that the original page is left untouched.
+            data = {key: list(column) for key, column in doc["data"].items()}
+            filled = {
+                key: list(column) for key, column in doc.get("filled", {}).items()
+            }
+            self._fill_event_page_columns(doc, data, filled, include, exclude)
+            page: EventPage = {
+                "time": list(doc["time"]),
+                "uid": list(doc["uid"]),
+                "seq_num": list(doc["seq_num"]),
+                "descriptor": doc["descriptor"],
+                "filled": filled,
+                "data": data,
+                "timestamps": {
+                    key: list(column) for key, column in doc["timestamps"].items()
+                },
+            }
+            return page
+
+    def _fill_event_page_columns(
+        self,
+        doc: EventPage,
+        data: dict,
+        filled: dict,
+        include: Optional[Iterable],
+        exclude: Optional[Iterable],
+    ) -> None:
+        """
+        Fill the columns of an EventPage without unpacking it into Events.
+
+        The ``data`` and ``filled`` dicts are updated in place. Each column that
+        gets filled is replaced by a new list, so the lists in ``doc`` are never
+        modified.
+        """
+        descriptor = self._descriptor_cache[doc["descriptor"]]
+        current_state = self._current_state
+        current_state.descriptor = descriptor
+        intervals = [0] + self.retry_intervals
+        for key, filled_column in list(filled.items()):
+            if exclude is not None and key in exclude:
+                continue
+            if include is not None and key not in include:
+                continue
+            rows = [i for i, val in enumerate(filled_column) if val is False]
+            if not rows:
+                continue
+            current_state.key = key
+            try:
+                data_column = data[key]
+            except KeyError as err:
+                raise MismatchedDataKeys(
+                    "The documents are not valid.  Either because they "
+                    "were recorded incorrectly in the first place, "
+                    "corrupted since, or exercising a yet-undiscovered "
+                    "bug in a reader. event['filled'].keys() "
+                    "must be a subset of event['data'].keys(). "
+                    f"event['data'].keys(): {data.keys()}, "
+                    "event['filled'].keys(): "
+                    f"{filled.keys()}"
+                ) from err
+            data[key] = data_column = list(data_column)
+            filled[key] = filled_column = list(filled_column)
+            for i in rows:
+                datum_id = data_column[i]
+                # Look up the cached Datum doc.
+                try:
+                    datum_doc = self._datum_cache[datum_id]
+                except KeyError as err:
+                    raise UnresolvableForeignKeyError(
+                        datum_id,
+                        f"Event with uid {doc['uid'][i]} refers to unknown Datum "
+                        f"datum_id {datum_id}",
+                    ) from err
+                resource_uid = datum_doc["resource"]
+                # Look up the cached Resource.
+                try:
+                    resource = self._resource_cache[resource_uid]
+                except KeyError as err:
+                    raise UnresolvableForeignKeyError(
+                        resource_uid,
+                        f"Datum with id {datum_id} refers to unknown Resource "
+                        f"uid {resource_uid}",
+                    ) from err
+                current_state.resource = resource
+                current_state.datum = datum_doc
+                handler = self._get_handler_maybe_cached(resource)
+                data_column[i] = _attempt_with_retries(
+                    func=handler,
+                    args=(),
+                    kwargs=datum_doc["datum_kwargs"],
+                    intervals=intervals,
+                    error_to_catch=IOError,
+                    # Only format the (large) message if loading fails.
+                    error_to_raise=partial(_data_not_accessible, datum_doc, resource),
+                )
+                filled_column[i] = datum_id
+        current_state.key = None
+        current_state.descriptor = None
+        current_state.resource = None
+        current_state.datum = None
 
     def get_handler(self, resource: Resource) -> Any:
         """
@@ -1055,21 +1246,25 @@ class Filler(DocumentRouter):
         root = self.root_map.get(original_root, original_root)
         if root:
             resource_path = os.path.join(root, resource_path)
-        msg = (
-            f"Error instantiating handler "
-            f"class {handler_class} "
-            f"with Resource document {resource}. "
-        )
-        if root != original_root:
-            msg += (
-                f"Its 'root' field was "
-                f"mapped from {original_root} to {root} by root_map."
-            )
-        else:
-            msg += (
-                f"Its 'root' field {original_root} was " f"*not* modified by root_map."
+
+        def error_to_raise() -> EventModelError:
+            # Only build the message if we actually fail.
+            msg = (
+                f"Error instantiating handler "
+                f"class {handler_class} "
+                f"with Resource document {resource}. "
             )
-        error_to_raise = EventModelError(msg)
+            if root != original_root:
+                msg += (
+                    f"Its 'root' field was "
+                    f"mapped from {original_root} to {root} by root_map."
+                )
+            else:
+                msg += (
+                    f"Its 'root' field {original_root} was *not* modified by root_map."
+                )
+            return EventModelError(msg)
+
         handler = _attempt_with_retries(
             func=handler_class,
             args=(resource_path,),
@@ -1102,27 +1297,35 @@ class Filler(DocumentRouter):
         if inplace:
             filled_doc = doc
         else:
-            filled_doc = copy.deepcopy(doc)
-        descriptor = self._descriptor_cache[doc["descriptor"]]
-        from_datakeys = False
-        self._current_state.descriptor = descriptor
-        try:
-            needs_filling = {key for key, val in doc["filled"].items() if val is False}
-        except KeyError:
-            # This document is not telling us which, if any, keys are filled.
-            # Infer that none of the external data is filled.
-            needs_filling = {
-                key for key, val in descriptor["data_keys"].items() if "external" in val
+            # Copy the document and its nested dicts, which are all that filling
+            # modifies, but share the values (which may be large arrays) with
+            # the original, as fill_event_page does for its columns.
+            filled_doc = {
+                key: dict(value) if isinstance(value, dict) else value
+                for key, value in doc.items()
             }
-            from_datakeys = True
+        descriptor = self._descriptor_cache[doc["descriptor"]]
+        # Bind the thread-local state once rather than looking it up on self
+        # for every field.
+        current_state = self._current_state
+        current_state.descriptor = descriptor
+        needs_filling, from_datakeys = self._needs_filling(
+            doc, descriptor, include, exclude
+        )
+        if not needs_filling:
+            current_state.descriptor = None
+            return filled_doc
+        # Avoid attribute and item lookups in the loop.
+        data = doc["data"]
+        filled_data = filled_doc["data"]
+        datum_cache = self._datum_cache
+        resource_cache = self._resource_cache
+        get_handler = self._get_handler_maybe_cached
+        intervals = [0] + self.retry_intervals
         for key in needs_filling:
-            self._current_state.key = key
-            if exclude is not None and key in exclude:
-                continue
-            if include is not None and key not in include:
-                continue
+            current_state.key = key
             try:
-                datum_id = doc["data"][key]
+                datum_id = data[key]
             except KeyError as err:
                 if from_datakeys:
                     raise MismatchedDataKeys(
@@ -1148,7 +1351,7 @@ class Filler(DocumentRouter):
                     ) from err
             # Look up the cached Datum doc.
             try:
-                datum_doc = self._datum_cache[datum_id]
+                datum_doc = datum_cache[datum_id]
             except KeyError as err:
                 raise UnresolvableForeignKeyError(
                     datum_id,
@@ -1158,38 +1361,76 @@ class Filler(DocumentRouter):
             resource_uid = datum_doc["resource"]
             # Look up the cached Resource.
             try:
-                resource = self._resource_cache[resource_uid]
+                resource = resource_cache[resource_uid]
             except KeyError as err:
                 raise UnresolvableForeignKeyError(
                     resource_uid,
                     f"Datum with id {datum_id} refers to unknown Resource "
                     f"uid {resource_uid}",
                 ) from err
-            self._current_state.resource = resource
-            self._current_state.datum = datum_doc
-            handler = self._get_handler_maybe_cached(resource)
-            error_to_raise = DataNotAccessible(
-                f"Filler was unable to load the data referenced by "
-                f"the Datum document {datum_doc} and the Resource "
-                f"document {resource}."
-            )
+            current_state.resource = resource
+            current_state.datum = datum_doc
+            handler = get_handler(resource)
             payload = _attempt_with_retries(
                 func=handler,
                 args=(),
                 kwargs=datum_doc["datum_kwargs"],
-                intervals=[0] + self.retry_intervals,
+                intervals=intervals,
                 error_to_catch=IOError,
-                error_to_raise=error_to_raise,
+                # Only format the (large) message if loading fails.
+                error_to_raise=partial(_data_not_accessible, datum_doc, resource),
             )
             # Here we are intentionally modifying doc in place.
-            filled_doc["data"][key] = payload
+            filled_data[key] = payload
             filled_doc["filled"][key] = datum_id
-        self._current_state.key = None
-        self._current_state.descriptor = None
-        self._current_state.resource = None
-        self._current_state.datum = None
+        current_state.key = None
+        current_state.descriptor = None
+        current_state.resource = None
+        current_state.datum = None
         return filled_doc
 
+    def _needs_filling(
+        self,
+        doc: Event,
+        descriptor: EventDescriptor,
+        include: Optional[Iterable],
+        exclude: Optional[Iterable],
+    ) -> Tuple[set, bool]:
+        """
+        Return the keys of an Event that should be filled, after include/exclude.
+
+        Also return whether those keys were inferred from the descriptor's
+        data_keys because the Event has no 'filled' field.
+        """
+        try:
+            needs_filling = {key for key, val in doc["filled"].items() if val is False}
+        except KeyError:
+            # This document is not telling us which, if any, keys are filled.
+            # Infer that none of the external data is filled. The external keys
+            # are the same for every Event in the stream, so look them up once.
+            # A descriptor may be registered again, or put in the descriptor
+            # cache directly, so only reuse keys computed from this very one.
+            cached = self._external_keys.get(descriptor["uid"])
+            if cached is not None and cached[0] is descriptor:
+                external_keys = cached[1]
+            else:
+                external_keys = frozenset(
+                    key
+                    for key, val in descriptor["data_keys"].items()
+                    if "external" in val
+                )
+                self._external_keys[descriptor["uid"]] = (descriptor, external_keys)
+            needs_filling = set(external_keys)
+            from_datakeys = True
+        else:
+            from_datakeys = False
+        # Apply include/exclude once, rather than testing each key in the loop.
+        if exclude is not None:
+            needs_filling.difference_update(exclude)
+        if include is not None:
+            needs_filling.intersection_update(include)
+        return needs_filling, from_datakeys
+
     def descriptor(self, doc: EventDescriptor) -> EventDescriptor:
         self._descriptor_cache[doc["uid"]] = doc
         return doc
@@ -1235,6 +1476,7 @@ class Filler(DocumentRouter):
         self._resource_cache.clear()
         self._descriptor_cache.clear()
         self._datum_cache.clear()
+        self._external_keys.clear()
 
     def __exit__(self, *exc_details) -> None:
         self.close()
@@ -1252,13 +1494,21 @@ class Filler(DocumentRouter):
 class EventModelError(Exception): ...
 
 
+def _data_not_accessible(datum: Datum, resource: Resource) -> "DataNotAccessible":
+    "Make the error raised when the data referenced by Datum cannot be loaded."
+    return DataNotAccessible(
+        f"Filler was unable to load the data referenced by the Datum "
+        f"document {datum} and the Resource document {resource}."
+    )
+
+
 def _attempt_with_retries(
     func,
     args,
     kwargs,
     intervals: Iterable,
     error_to_catch: Type[OSError],
-    error_to_raise: EventModelError,
+    error_to_raise: Union[EventModelError, Callable[[], EventModelError]],
 ) -> Any:
     """
     Return func(*args, **kwargs), using a retry loop.
@@ -1268,12 +1518,16 @@ def _attempt_with_retries(
         How long to wait (seconds) between each attempt including the first.
     error_to_catch: Exception class
         If this is raised, retry.
-    error_to_raise: Exception instance or class
-        If we run out of retries, raise this from the proximate error.
+    error_to_raise: Exception instance or class, or callable
+        If we run out of retries, raise this from the proximate error. A
+        callable is called with no arguments to make the exception, so that
+        an expensive message need only be built on failure.
     """
     error = None
     for interval in intervals:
-        ttime.sleep(interval)
+        if interval:
+            # Do not pay for a sleep call before the (usual) immediate attempt.
+            ttime.sleep(interval)
         try:
             return func(*args, **kwargs)
         except error_to_catch as error_:
@@ -1286,6 +1540,8 @@ def _attempt_with_retries(
     else:
         # We have used up all our attempts. There seems to be an
         # actual problem. Raise specified error from the error stashed above.
+        if not isinstance(error_to_raise, BaseException):
+            error_to_raise = error_to_raise()
         raise error_to_raise from error
 
 
@@ -1312,15 +1568,72 @@ class NoFiller(Filler):
         exclude: Optional[Iterable] = None,
         *kwargs,
     ) -> EventPage:
-        filled_events = []
-        for event_doc in unpack_event_page(doc):
-            filled_events.append(
-                self.fill_event(
-                    event_doc, include=include, exclude=exclude, inplace=True
+        if type(self).fill_event is not NoFiller.fill_event:
+            # A subclass customizes fill_event; respect that by going row-wise.
+            filled_events = []
+            for event_doc in unpack_event_page(doc):
+                filled_events.append(
+                    self.fill_event(
+                        event_doc, include=include, exclude=exclude, inplace=True
+                    )
                 )
-            )
-        filled_doc = pack_event_page(*filled_events)
-        return filled_doc
+            return _pack_event_page(filled_events)
+        # Validate the columns directly; there is nothing to fill, so there is
+        # no need to unpack the page into Events and pack it again.
+        data = doc["data"]
+        # Like Filler, treat a page without 'filled' as having nothing to fill.
+        filled = doc.get("filled", {})
+        rows_by_key: Dict[str, Sequence[int]] = {
+            key: [i for i, val in enumerate(column) if val is False]
+            for key, column in filled.items()
+        }
+        if exclude is not None:
+            for key in exclude:
+                rows_by_key.pop(key, None)
+        if include is not None:
+            rows_by_key = {
+                key: rows for key, rows in rows_by_key.items() if key in include
+            }
+        datum_cache = self._datum_cache
+        resource_cache = self._resource_cache
+        for key, rows in rows_by_key.items():
+            if not rows:
+                continue
+            try:
+                data_column = data[key]
+            except KeyError as err:
+                raise MismatchedDataKeys(
+                    "The documents are not valid.  Either because they "
+                    "were recorded incorrectly in the first place, "
+                    "corrupted since, or exercising a yet-undiscovered "
+                    "bug in a reader. event['filled'].keys() "
+                    "must be a subset of event['data'].keys(). "
+                    f"event['data'].keys(): {data.keys()}, "
+                    "event['filled'].keys(): "
+                    f"{filled.keys()}"
+                ) from err
+            for i in rows:
+                datum_id = data_column[i]
+                # Look up the cached Datum doc.
+                try:
+                    datum_doc = datum_cache[datum_id]
+                except KeyError as err:
+                    raise UnresolvableForeignKeyError(
+                        datum_id,
+                        f"Event with uid {doc['uid'][i]} refers to unknown Datum "
+                        f"datum_id {datum_id}",
+                    ) from err
+                resource_uid = datum_doc["resource"]
+                # Look up the cached Resource.
+                try:
+                    resource_cache[resource_uid]
+                except KeyError as err:
+                    raise UnresolvableForeignKeyError(
+                        datum_id,
+                        f"Datum with id {datum_id} refers to unknown Resource "
+                        f"uid {resource_uid}",
+                    ) from err
+        return doc
 
     def fill_event(
         self,
@@ -1330,21 +1643,10 @@ class NoFiller(Filler):
         inplace: Optional[bool] = None,
     ) -> Event:
         descriptor = self._descriptor_cache[doc["descriptor"]]
-        from_datakeys = False
-        try:
-            needs_filling = {key for key, val in doc["filled"].items() if val is False}
-        except KeyError:
-            # This document is not telling us which, if any, keys are filled.
-            # Infer that none of the external data is filled.
-            needs_filling = {
-                key for key, val in descriptor["data_keys"].items() if "external" in val
-            }
-            from_datakeys = True
+        needs_filling, from_datakeys = self._needs_filling(
+            doc, descriptor, include, exclude
+        )
         for key in needs_filling:
-            if exclude is not None and key in exclude:
-                continue
-            if include is not None and key not in include:
-                continue
             try:
                 datum_id = doc["data"][key]
             except KeyError as err:
@@ -1407,6 +1709,10 @@ DOCS_PASSED_IN_1_14_0_WARNING = (
 )
 
 
+# The number of old-style Resources (with no RunStart UID) RunRouter remembers.
+_UNLABELED_RESOURCES_MAXLEN = 10000
+
+
 class RunRouter(DocumentRouter):
     """
     Routes documents, by run, to callbacks it creates from factory functions.
@@ -1506,18 +1812,16 @@ class RunRouter(DocumentRouter):
         # RunStart UID.
         self._factory_cbs_by_start: defaultdict = defaultdict(list)
 
-        # Callbacks that want all the documents from a given run, keyed on
-        # each EventDescriptor UID in the run.
-        self._factory_cbs_by_descriptor: defaultdict = defaultdict(list)
-
-        # Callbacks that want documents related to a given EventDescriptor,
-        # keyed on EventDescriptor UID.
-        self._subfactory_cbs_by_descriptor: defaultdict = defaultdict(list)
-
         # Callbacks that want documents related to a given EventDescriptor,
         # keyed on the RunStart UID referenced by that EventDescriptor.
         self._subfactory_cbs_by_start: defaultdict = defaultdict(list)
 
+        # All of the above callbacks for each RunStart UID and for each
+        # EventDescriptor UID, factory callbacks first, so that documents can
+        # be fanned out to them in one loop.
+        self._cbs_by_start: defaultdict = defaultdict(list)
+        self._cbs_by_descriptor: defaultdict = defaultdict(list)
+
         # Map RunStart UID to RunStart document. This is used to send
         # RunStart documents to subfactory callbacks.
         self._start_to_start_doc: dict = {}
@@ -1534,8 +1838,10 @@ class RunRouter(DocumentRouter):
         self._resources: dict = {}
         self._stream_resources: dict = {}
 
-        # Old-style Resources that do not have a RunStart UID
-        self._unlabeled_resources: deque = deque(maxlen=10000)
+        # Old-style Resources that do not have a RunStart UID. This is used as
+        # a bounded, insertion-ordered set: the keys are the Resource UIDs and
+        # the oldest are discarded beyond _UNLABELED_RESOURCES_MAXLEN.
+        self._unlabeled_resources: OrderedDict = OrderedDict()
 
         # Map Runstart UID to instances of self.filler_class.
         self._fillers: dict = {}
@@ -1554,8 +1860,7 @@ class RunRouter(DocumentRouter):
         if uid in self._start_to_start_doc:
             if self._start_to_start_doc[uid] == start_doc:
                 raise ValueError(
-                    "RunRouter received the same 'start' document twice:\n"
-                    "{start_doc!r}"
+                    "RunRouter received the same 'start' document twice:\n{start_doc!r}"
                 )
             else:
                 raise ValueError(
@@ -1585,6 +1890,7 @@ class RunRouter(DocumentRouter):
                     )
                     raise err
             self._factory_cbs_by_start[uid].extend(callbacks)
+            self._cbs_by_start[uid].extend(callbacks)
             self._subfactories[uid].extend(subfactories)
 
     def descriptor(self, descriptor_doc: EventDescriptor) -> None:
@@ -1601,14 +1907,15 @@ class RunRouter(DocumentRouter):
         self._fillers[start_uid].descriptor(descriptor_doc)
         # Apply all factory cbs for this run to this descriptor, and run them.
         factory_cbs = self._factory_cbs_by_start[start_uid]
-        self._factory_cbs_by_descriptor[descriptor_uid].extend(factory_cbs)
+        self._cbs_by_descriptor[descriptor_uid].extend(factory_cbs)
         for callback in factory_cbs:
             callback("descriptor", descriptor_doc)
         # Let all the subfactories add any relevant callbacks.
         for subfactory in self._subfactories[start_uid]:
             callbacks = subfactory("descriptor", descriptor_doc)
             self._subfactory_cbs_by_start[start_uid].extend(callbacks)
-            self._subfactory_cbs_by_descriptor[descriptor_uid].extend(callbacks)
+            self._cbs_by_start[start_uid].extend(callbacks)
+            self._cbs_by_descriptor[descriptor_uid].extend(callbacks)
             for callback in callbacks:
                 try:
                     start_doc = self._start_to_start_doc[start_uid]
@@ -1640,9 +1947,7 @@ class RunRouter(DocumentRouter):
         except UndefinedAssetSpecification:
             if self.fill_or_fail:
                 raise
-        for callback in self._factory_cbs_by_descriptor[descriptor_uid]:
-            callback("event_page", doc)
-        for callback in self._subfactory_cbs_by_descriptor[descriptor_uid]:
+        for callback in self._cbs_by_descriptor.get(descriptor_uid, ()):
             callback("event_page", doc)
 
     def datum_page(self, doc: DatumPage) -> None:
@@ -1671,18 +1976,14 @@ class RunRouter(DocumentRouter):
                 filler.datum_page(doc)
         else:
             self._fillers[start_uid].datum_page(doc)
-            for callback in self._factory_cbs_by_start[start_uid]:
-                callback("datum_page", doc)
-            for callback in self._subfactory_cbs_by_start[start_uid]:
+            for callback in self._cbs_by_start.get(start_uid, ()):
                 callback("datum_page", doc)
 
     def stream_datum(self, doc: StreamDatum) -> None:
         resource_uid = doc["stream_resource"]
         start_uid = self._stream_resources[resource_uid]
         self._fillers[start_uid].stream_datum(doc)
-        for callback in self._factory_cbs_by_start[start_uid]:
-            callback("stream_datum", doc)
-        for callback in self._subfactory_cbs_by_start[start_uid]:
+        for callback in self._cbs_by_start.get(start_uid, ()):
             callback("stream_datum", doc)
 
     def resource(self, doc: Resource) -> None:
@@ -1693,7 +1994,10 @@ class RunRouter(DocumentRouter):
             # Fan them out to every run currently flowing through RunRouter. If
             # they are not applicable they will do no harm, and this is
             # expected to be an increasingly rare case.
-            self._unlabeled_resources.append(doc["uid"])
+            self._unlabeled_resources[doc["uid"]] = None
+            self._unlabeled_resources.move_to_end(doc["uid"])
+            if len(self._unlabeled_resources) > _UNLABELED_RESOURCES_MAXLEN:
+                self._unlabeled_resources.popitem(last=False)
             for callbacks in self._factory_cbs_by_start.values():
                 for callback in callbacks:
                     callback("resource", doc)
@@ -1705,35 +2009,29 @@ class RunRouter(DocumentRouter):
         else:
             self._fillers[start_uid].resource(doc)
             self._resources[doc["uid"]] = doc["run_start"]
-            for callback in self._factory_cbs_by_start[start_uid]:
-                callback("resource", doc)
-            for callback in self._subfactory_cbs_by_start[start_uid]:
+            for callback in self._cbs_by_start.get(start_uid, ()):
                 callback("resource", doc)
 
     def stream_resource(self, doc: StreamResource) -> None:
         start_uid = doc["run_start"]  # No need for Try
         self._fillers[start_uid].stream_resource(doc)
         self._stream_resources[doc["uid"]] = doc["run_start"]
-        for callback in self._factory_cbs_by_start[start_uid]:
-            callback("stream_resource", doc)
-        for callback in self._subfactory_cbs_by_start[start_uid]:
+        for callback in self._cbs_by_start.get(start_uid, ()):
             callback("stream_resource", doc)
 
     def stop(self, doc: RunStop) -> None:
         start_uid = doc["run_start"]
-        for callback in self._factory_cbs_by_start[start_uid]:
-            callback("stop", doc)
-        for callback in self._subfactory_cbs_by_start[start_uid]:
+        for callback in self._cbs_by_start.get(start_uid, ()):
             callback("stop", doc)
         # Clean up references.
         self._fillers.pop(start_uid, None)
         self._subfactories.pop(start_uid, None)
         self._factory_cbs_by_start.pop(start_uid, None)
         self._subfactory_cbs_by_start.pop(start_uid, None)
+        self._cbs_by_start.pop(start_uid, None)
         for descriptor_uid in self._start_to_descriptors.pop(start_uid, ()):
             self._descriptor_to_start.pop(descriptor_uid, None)
-            self._factory_cbs_by_descriptor.pop(descriptor_uid, None)
-            self._subfactory_cbs_by_descriptor.pop(descriptor_uid, None)
+            self._cbs_by_descriptor.pop(descriptor_uid, None)
         self._resources.pop(start_uid, None)
         self._start_to_start_doc.pop(start_uid, None)
 
@@ -1833,13 +2131,9 @@ for name, filename in SCHEMA_NAMES.items():
 
 
 def _is_array(checker, instance):
-    return (
-        jsonschema.validators.Draft202012Validator.TYPE_CHECKER.is_type(
-            instance, "array"
-        )
-        or isinstance(instance, tuple)
-        or hasattr(instance, "__array__")
-    )
+    # The draft 2020-12 "array" check is isinstance(instance, list); test that
+    # directly rather than dispatching through its TYPE_CHECKER on every call.
+    return isinstance(instance, (list, tuple)) or hasattr(instance, "__array__")
 
 
 _array_type_checker = jsonschema.validators.Draft202012Validator.TYPE_CHECKER.redefine(
@@ -1854,6 +2148,38 @@ schema_validators = {
     name: _Validator(schema=schema) for name, schema in schemas.items()
 }
 
+# The bound validate method of each validator, keyed by the plain document
+# name that DocumentRouter._dispatch receives.
+_VALIDATE_BY_NAME: Dict[str, Callable] = {
+    name.name: validator.validate for name, validator in schema_validators.items()
+}
+
+
+# A private generator, seeded from os.urandom, so that seeding the global
+# ``random`` state (common in tests and simulations) cannot make uids repeat.
+_uid_random = Random(os.urandom(32))
+if hasattr(os, "register_at_fork"):
+    # Like the global generator, reseed in a forked child so that the parent
+    # and the child do not produce the same sequence of uids.
+    os.register_at_fork(after_in_child=lambda: _uid_random.seed(os.urandom(32)))
+
+
+def _new_uid() -> str:
+    """
+    Return a random UUID4 string to use as a default document uid.
+
+    Document uids are identifiers, not secrets, so this draws from a fast
+    ``random.Random`` instead of the ``os.urandom`` used by ``uuid.uuid4()``.
+    The version and variant bits are set as in ``uuid.uuid4()``, so the result
+    is a valid, canonically formatted UUID4. Callers that need uids from a
+    cryptographic source can generate them and pass ``uid`` explicitly.
+    """
+    x = _uid_random.getrandbits(128)
+    x = (x & ~(0xF000 << 64)) | (0x4000 << 64)  # version 4
+    x = (x & ~(0xC000 << 48)) | (0x8000 << 48)  # RFC 4122 variant
+    h = f"{x:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 
 @dataclass
 class ComposeDatum:
@@ -1956,7 +2282,7 @@ class ComposeResource:
         validate: bool = True,
     ) -> ComposeResourceBundle:
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = _new_uid()
 
         doc = Resource(
             path_semantics=path_semantics,
@@ -2091,7 +2417,7 @@ class ComposeStreamResource:
         validate: bool = True,
     ) -> ComposeStreamResourceBundle:
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = _new_uid()
 
         doc = StreamResource(
             uid=uid,
@@ -2155,13 +2481,13 @@ class ComposeStop:
     ) -> RunStop:
         if self.poison_pill:
             raise EventModelError(
-                "Already composed a RunStop document for run " "{!r}.".format(
+                "Already composed a RunStop document for run {!r}.".format(
                     self.start["uid"]
                 )
             )
         self.poison_pill.append(object())
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = _new_uid()
         if time is None:
             time = ttime.time()
         doc = RunStop(
@@ -2210,10 +2536,27 @@ def length_of_value(dictionary: Dict[str, List], error_msg: str) -> Optional[int
 
 
 @dataclass
-class ComposeEventPage:
+class _ComposeFromDescriptor:
+    "The state shared by ComposeEvent and ComposeEventPage."
+
     descriptor: EventDescriptor
     event_counters: Dict[str, int]
+    # Constant per descriptor, so looked up once rather than on every call.
+    _descriptor_uid: str = field(init=False, repr=False, compare=False)
+    _descriptor_name: str = field(init=False, repr=False, compare=False)
+    _descriptor_keys: set = field(init=False, repr=False, compare=False)
+    _has_stream_keys: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        data_keys = self.descriptor["data_keys"]
+        self._descriptor_uid = self.descriptor["uid"]
+        self._descriptor_name = self.descriptor["name"]
+        self._descriptor_keys = set(keys_without_stream_keys(data_keys, data_keys))
+        self._has_stream_keys = len(self._descriptor_keys) != len(data_keys)
 
+
+@dataclass
+class ComposeEventPage(_ComposeFromDescriptor):
     def __call__(
         self,
         data: Dict[str, List],
@@ -2239,14 +2582,15 @@ class ComposeEventPage:
             "length to those in `data`"
         )
 
+        descriptor_name = self._descriptor_name
         if seq_num is None:
-            last_seq_num = self.event_counters[self.descriptor["name"]]
+            last_seq_num = self.event_counters[descriptor_name]
             seq_num = list(
                 range(last_seq_num, len(next(iter(data.values()))) + last_seq_num)
             )
         N = len(seq_num)
         if uid is None:
-            uid = [str(uuid.uuid4()) for _ in range(N)]
+            uid = [_new_uid() for _ in range(N)]
         if time is None:
             time = [ttime.time()] * N
         if filled is None:
@@ -2258,39 +2602,35 @@ class ComposeEventPage:
             timestamps=timestamps,
             seq_num=seq_num,
             filled=filled,
-            descriptor=self.descriptor["uid"],
+            descriptor=self._descriptor_uid,
         )
         if validate:
             schema_validators[DocumentNames.event_page].validate(doc)
 
-            if not (
-                set(
-                    keys_without_stream_keys(
-                        self.descriptor["data_keys"], self.descriptor["data_keys"]
-                    )
-                )
-                == set(keys_without_stream_keys(data, self.descriptor["data_keys"]))
-                == set(
-                    keys_without_stream_keys(timestamps, self.descriptor["data_keys"])
+            descriptor_data_keys = self.descriptor["data_keys"]
+            if self._has_stream_keys:
+                keys_match = (
+                    self._descriptor_keys
+                    == set(keys_without_stream_keys(data, descriptor_data_keys))
+                    == set(keys_without_stream_keys(timestamps, descriptor_data_keys))
                 )
-            ):
+            else:
+                # Nothing to filter out, so compare the key views directly.
+                keys_match = data.keys() == self._descriptor_keys == timestamps.keys()
+            if not keys_match:
                 raise EventModelValidationError(
                     'These sets of keys must match (other than "STREAM:" keys):\n'
-                    "event['data'].keys(): {}\n"
-                    "event['timestamps'].keys(): {}\n"
-                    "descriptor['data_keys'].keys(): {}\n".format(
-                        data.keys(),
-                        timestamps.keys(),
-                        self.descriptor["data_keys"].keys(),
-                    )
+                    f"event['data'].keys(): {data.keys()}\n"
+                    f"event['timestamps'].keys(): {timestamps.keys()}\n"
+                    f"descriptor['data_keys'].keys(): {descriptor_data_keys.keys()}\n"
                 )
-            if set(filled) - set(data):
+            if filled and not filled.keys() <= data.keys():
                 raise EventModelValidationError(
                     f"Keys in event['filled'] {filled.keys()} "
                     "must be a subset of those in "
                     f"event['data'] {data.keys()}"
                 )
-        self.event_counters[self.descriptor["name"]] += len(seq_num)
+        self.event_counters[descriptor_name] += len(seq_num)
         return doc
 
 
@@ -2332,10 +2672,7 @@ def keys_without_stream_keys(dictionary, descriptor_data_keys):
 
 
 @dataclass
-class ComposeEvent:
-    descriptor: EventDescriptor
-    event_counters: Dict[str, int]
-
+class ComposeEvent(_ComposeFromDescriptor):
     def __call__(
         self,
         data: dict,
@@ -2346,54 +2683,53 @@ class ComposeEvent:
         time: Optional[float] = None,
         validate: bool = True,
     ) -> Event:
+        descriptor_name = self._descriptor_name
         if seq_num is None:
-            seq_num = self.event_counters[self.descriptor["name"]]
+            seq_num = self.event_counters[descriptor_name]
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = _new_uid()
         if time is None:
             time = ttime.time()
         if filled is None:
             filled = {}
-        doc = Event(
-            uid=uid,
-            time=time,
-            data=data,
-            timestamps=timestamps,
-            seq_num=seq_num,
-            filled=filled,
-            descriptor=self.descriptor["uid"],
-        )
+        # A dict display is much cheaper than calling the TypedDict with
+        # keyword arguments, and this runs once per Event.
+        doc: Event = {
+            "uid": uid,
+            "time": time,
+            "data": data,
+            "timestamps": timestamps,
+            "seq_num": seq_num,
+            "filled": filled,
+            "descriptor": self._descriptor_uid,
+        }
         if validate:
             schema_validators[DocumentNames.event].validate(doc)
 
-            if not (
-                set(
-                    keys_without_stream_keys(
-                        self.descriptor["data_keys"], self.descriptor["data_keys"]
-                    )
+            descriptor_data_keys = self.descriptor["data_keys"]
+            if self._has_stream_keys:
+                keys_match = (
+                    self._descriptor_keys
+                    == set(keys_without_stream_keys(data, descriptor_data_keys))
+                    == set(keys_without_stream_keys(timestamps, descriptor_data_keys))
                 )
-                == set(keys_without_stream_keys(data, self.descriptor["data_keys"]))
-                == set(
-                    keys_without_stream_keys(timestamps, self.descriptor["data_keys"])
-                )
-            ):
+            else:
+                # Nothing to filter out, so compare the key views directly.
+                keys_match = data.keys() == self._descriptor_keys == timestamps.keys()
+            if not keys_match:
                 raise EventModelValidationError(
                     'These sets of keys must match (other than "STREAM:" keys):\n'
-                    "event['data'].keys(): {}\n"
-                    "event['timestamps'].keys(): {}\n"
-                    "descriptor['data_keys'].keys(): {}\n".format(
-                        data.keys(),
-                        timestamps.keys(),
-                        self.descriptor["data_keys"].keys(),
-                    )
+                    f"event['data'].keys(): {data.keys()}\n"
+                    f"event['timestamps'].keys(): {timestamps.keys()}\n"
+                    f"descriptor['data_keys'].keys(): {descriptor_data_keys.keys()}\n"
                 )
-            if set(filled) - set(data):
+            if filled and not filled.keys() <= data.keys():
                 raise EventModelValidationError(
                     f"Keys in event['filled'] {filled.keys()} "
                     "must be a subset of those in "
                     f"event['data'] {data.keys()}"
                 )
-        self.event_counters[self.descriptor["name"]] = seq_num + 1
+        self.event_counters[descriptor_name] = seq_num + 1
         return doc
 
 
@@ -2459,7 +2795,7 @@ class ComposeDescriptor:
         if time is None:
             time = ttime.time()
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = _new_uid()
         if hints is None:
             hints = {}
         if configuration is None:
@@ -2477,18 +2813,19 @@ class ComposeDescriptor:
             uid=uid,
             hints=hints,
         )
+        data_keys_set = set(data_keys)
         if validate:
-            if name in self.streams and self.streams[name] != set(data_keys):
+            if name in self.streams and self.streams[name] != data_keys_set:
                 raise EventModelValidationError(
                     f"A descriptor with the name {name} has already been composed with "
                     f"data_keys {self.streams[name]}. The requested data_keys were "
-                    f"{set(data_keys)}. All descriptors in a given stream must have "
+                    f"{data_keys_set}. All descriptors in a given stream must have "
                     "the same data_keys."
                 )
             schema_validators[DocumentNames.descriptor].validate(doc)
 
         if name not in self.streams:
-            self.streams[name] = set(data_keys)
+            self.streams[name] = data_keys_set
             self.event_counters[name] = 1
 
         return ComposeDescriptorBundle(
@@ -2591,7 +2928,7 @@ def compose_run(
     ComposeRunBundle
     """
     if uid is None:
-        uid = str(uuid.uuid4())
+        uid = _new_uid()
     if time is None:
         time = ttime.time()
     if metadata is None:
@@ -2637,33 +2974,47 @@ def pack_event_page(*events: Event) -> EventPage:
     -------
     event_page : dict
     """
+    return _pack_event_page(events)
+
+
+def _pack_event_page(events: Sequence[Event]) -> EventPage:
+    "Like pack_event_page, but takes a sequence rather than *args."
     if not events:
         raise ValueError(
             "The pack_event_page() function was called with empty *args. "
             "Cannot create an EventPage from an empty collection of Events "
             "because the 'descriptor' field in an EventPage cannot be NULL."
         )
-    time_list = []
-    uid_list = []
-    seq_num_list = []
-    data_list = []
-    filled_list = []
-    timestamps_list = []
+    time_list: list = []
+    uid_list: list = []
+    seq_num_list: list = []
+    data: dict = defaultdict(list)
+    filled: dict = defaultdict(list)
+    timestamps: dict = defaultdict(list)
+    # Avoid attribute lookups in the hot loop.
+    time_append = time_list.append
+    uid_append = uid_list.append
+    seq_num_append = seq_num_list.append
+    # Fill the columns in a single pass over the events, rather than building
+    # intermediate lists of rows and transposing each of them afterward.
     for event in events:
-        time_list.append(event["time"])
-        uid_list.append(event["uid"])
-        seq_num_list.append(event["seq_num"])
-        filled_list.append(event.get("filled", {}))
-        data_list.append(event["data"])
-        timestamps_list.append(event["timestamps"])
+        time_append(event["time"])
+        uid_append(event["uid"])
+        seq_num_append(event["seq_num"])
+        for k, v in event["data"].items():
+            data[k].append(v)
+        for k, v in event["timestamps"].items():
+            timestamps[k].append(v)
+        for k, v in event.get("filled", {}).items():
+            filled[k].append(v)
     event_page = EventPage(
         time=time_list,
         uid=uid_list,
         seq_num=seq_num_list,
         descriptor=event["descriptor"],
-        filled=_transpose_list_of_dicts(filled_list),
-        data=_transpose_list_of_dicts(data_list),
-        timestamps=_transpose_list_of_dicts(timestamps_list),
+        filled=dict(filled),
+        data=dict(data),
+        timestamps=dict(timestamps),
     )
     return event_page
 
@@ -2681,27 +3032,31 @@ def unpack_event_page(event_page: EventPage) -> Generator:
     event : Event
     """
     descriptor = event_page["descriptor"]
-    data_list = _transpose_dict_of_lists(event_page["data"])
-    timestamps_list = _transpose_dict_of_lists(event_page["timestamps"])
-    filled_list = _transpose_dict_of_lists(event_page.get("filled", {}))
-    for uid, time, seq_num, data, timestamps, filled in itertools.zip_longest(
+    # Build each row lazily, so that only one Event's worth of dicts exists at
+    # a time rather than three full lists-of-dicts for the whole page.
+    data_rows = _iter_rows(event_page["data"])
+    timestamps_rows = _iter_rows(event_page["timestamps"])
+    filled_rows = _iter_rows(event_page.get("filled", {}))
+    for uid, time, seq_num, data, timestamps, filled in zip(
         event_page["uid"],
         event_page["time"],
         event_page["seq_num"],
-        data_list,
-        timestamps_list,
-        filled_list,
-        fillvalue={},
+        data_rows,
+        timestamps_rows,
+        filled_rows,
     ):
-        yield Event(
-            descriptor=descriptor,
-            uid=uid,
-            time=time,
-            seq_num=seq_num,
-            data=data,
-            timestamps=timestamps,
-            filled=filled,
-        )
+        # A dict display is much cheaper than calling the TypedDict with
+        # keyword arguments, and this runs once per Event.
+        event: Event = {
+            "descriptor": descriptor,
+            "uid": uid,
+            "time": time,
+            "seq_num": seq_num,
+            "data": data,
+            "timestamps": timestamps,
+            "filled": filled,
+        }
+        yield event
 
 
 def pack_datum_page(*datum: Datum) -> DatumPage:
@@ -2717,6 +3072,11 @@ def pack_datum_page(*datum: Datum) -> DatumPage:
     -------
     datum_page : dict
     """
+    return _pack_datum_page(datum)
+
+
+def _pack_datum_page(datum: Sequence[Datum]) -> DatumPage:
+    "Like pack_datum_page, but takes a sequence rather than *args."
     if not datum:
         raise ValueError(
             "The pack_datum_page() function was called with empty *args. "
@@ -2749,13 +3109,16 @@ def unpack_datum_page(datum_page: DatumPage) -> Generator:
     datum : Datum
     """
     resource = datum_page["resource"]
-    datum_kwarg_list = _transpose_dict_of_lists(datum_page["datum_kwargs"])
+    datum_kwarg_rows = _iter_rows(datum_page["datum_kwargs"])
     datum_id: Any
     datum_kwargs: Any
-    for datum_id, datum_kwargs in itertools.zip_longest(
-        datum_page["datum_id"], datum_kwarg_list, fillvalue={}
-    ):
-        yield Datum(datum_id=datum_id, datum_kwargs=datum_kwargs, resource=resource)
+    for datum_id, datum_kwargs in zip(datum_page["datum_id"], datum_kwarg_rows):
+        datum: Datum = {
+            "datum_id": datum_id,
+            "datum_kwargs": datum_kwargs,
+            "resource": resource,
+        }
+        yield datum
 
 
 def rechunk_event_pages(event_pages: Iterable, chunk_size: int) -> Generator:
@@ -2782,8 +3145,14 @@ def rechunk_event_pages(event_pages: Iterable, chunk_size: int) -> Generator:
         The first chunk will be of size remainder, the following chunks will be
         of size chunk_size. The last chunk will be what ever is left over.
         """
-        array_keys = ["seq_num", "time", "uid"]
-        page_size = len(page["uid"])  # Number of events in the page.
+        descriptor = page["descriptor"]
+        seq_num = page["seq_num"]
+        time = page["time"]
+        uid = page["uid"]
+        data_items = list(page["data"].items())
+        timestamps_items = list(page["timestamps"].items())
+        filled_items = list(page.get("filled", {}).items())
+        page_size = len(uid)  # Number of events in the page.
 
         # Make a list of the chunk indexes.
         chunks = [(0, remainder)]
@@ -2793,19 +3162,15 @@ def rechunk_event_pages(event_pages: Iterable, chunk_size: int) -> Generator:
 
         for start, stop in chunks:
             yield {
-                "descriptor": page["descriptor"],
-                **{key: page[key][start:stop] for key in array_keys},
-                "data": {
-                    key: page["data"][key][start:stop] for key in page["data"].keys()
-                },
+                "descriptor": descriptor,
+                "seq_num": seq_num[start:stop],
+                "time": time[start:stop],
+                "uid": uid[start:stop],
+                "data": {key: column[start:stop] for key, column in data_items},
                 "timestamps": {
-                    key: page["timestamps"][key][start:stop]
-                    for key in page["timestamps"].keys()
-                },
-                "filled": {
-                    key: page["filled"][key][start:stop]
-                    for key in page["filled"].keys()
+                    key: column[start:stop] for key, column in timestamps_items
                 },
+                "filled": {key: column[start:stop] for key, column in filled_items},
             }
 
     for page in event_pages:
@@ -2838,33 +3203,37 @@ def merge_event_pages(event_pages: Iterable[EventPage]) -> EventPage:
     if len(pages) == 1:
         return pages[0]
 
+    # Extend each output column page by page, in a single pass over the pages.
+    first_page = pages[0]
+    seq_num: list = []
+    time: list = []
+    uid: list = []
+    data: dict = {key: [] for key in first_page["data"]}
+    timestamps: dict = {key: [] for key in first_page["timestamps"]}
+    filled: dict = {key: [] for key in first_page.get("filled", {})}
+    for page in pages:
+        seq_num.extend(page["seq_num"])
+        time.extend(page["time"])
+        uid.extend(page["uid"])
+        page_data = page["data"]
+        for key, column in data.items():
+            column.extend(page_data[key])
+        page_timestamps = page["timestamps"]
+        for key, column in timestamps.items():
+            column.extend(page_timestamps[key])
+        if filled:
+            page_filled = page["filled"]
+            for key, column in filled.items():
+                column.extend(page_filled[key])
+
     doc = {
-        "descriptor": pages[0]["descriptor"],
-        "seq_num": list(
-            itertools.chain.from_iterable([page["seq_num"] for page in pages])
-        ),
-        "time": list(itertools.chain.from_iterable([page["time"] for page in pages])),
-        "uid": list(itertools.chain.from_iterable([page["uid"] for page in pages])),
-        "data": {
-            key: list(
-                itertools.chain.from_iterable([page["data"][key] for page in pages])
-            )
-            for key in pages[0]["data"].keys()
-        },
-        "timestamps": {
-            key: list(
-                itertools.chain.from_iterable(
-                    [page["timestamps"][key] for page in pages]
-                )
-            )
-            for key in pages[0]["data"].keys()
-        },
-        "filled": {
-            key: list(
-                itertools.chain.from_iterable([page["filled"][key] for page in pages])
-            )
-            for key in pages[0]["filled"].keys()
-        },
+        "descriptor": first_page["descriptor"],
+        "seq_num": seq_num,
+        "time": time,
+        "uid": uid,
+        "data": data,
+        "timestamps": timestamps,
+        "filled": filled,
     }
     return cast(EventPage, doc)
 
@@ -2893,9 +3262,10 @@ def rechunk_datum_pages(datum_pages: Iterable, chunk_size: int) -> Generator:
         The first chunk will be of size remainder, the following chunks will be
         of size chunk_size. The last chunk will be what ever is left over.
         """
-
-        array_keys = ["datum_id"]
-        page_size = len(page["datum_id"])  # Number of datum in the page.
+        resource = page["resource"]
+        datum_id = page["datum_id"]
+        datum_kwargs_items = list(page["datum_kwargs"].items())
+        page_size = len(datum_id)  # Number of datum in the page.
 
         # Make a list of the chunk indexes.
         chunks = [(0, remainder)]
@@ -2905,11 +3275,10 @@ def rechunk_datum_pages(datum_pages: Iterable, chunk_size: int) -> Generator:
 
         for start, stop in chunks:
             yield {
-                "resource": page["resource"],
-                **{key: page[key][start:stop] for key in array_keys},
+                "resource": resource,
+                "datum_id": datum_id[start:stop],
                 "datum_kwargs": {
-                    key: page["datum_kwargs"][key][start:stop]
-                    for key in page["datum_kwargs"].keys()
+                    key: column[start:stop] for key, column in datum_kwargs_items
                 },
             }
 
@@ -2943,23 +3312,21 @@ def merge_datum_pages(datum_pages: Iterable) -> DatumPage:
     if len(pages) == 1:
         return pages[0]
 
-    array_keys = ["datum_id"]
-
-    doc = dict(
-        resource=pages[0]["resource"],
-        **{
-            key: list(itertools.chain.from_iterable([page[key] for page in pages]))
-            for key in array_keys
-        },
-        datum_kwargs={
-            key: list(
-                itertools.chain.from_iterable(
-                    [page["datum_kwargs"][key] for page in pages]
-                )
-            )
-            for key in pages[0]["datum_kwargs"].keys()
-        },
-    )
+    # Extend each output column page by page, in a single pass over the pages.
+    first_page = pages[0]
+    datum_id: list = []
+    datum_kwargs: dict = {key: [] for key in first_page["datum_kwargs"]}
+    for page in pages:
+        datum_id.extend(page["datum_id"])
+        page_datum_kwargs = page["datum_kwargs"]
+        for key, column in datum_kwargs.items():
+            column.extend(page_datum_kwargs[key])
+
+    doc = {
+        "resource": first_page["resource"],
+        "datum_id": datum_id,
+        "datum_kwargs": datum_kwargs,
+    }
     return cast(DatumPage, doc)
 
 
@@ -3031,13 +3398,74 @@ def _transpose_list_of_dicts(list_of_dicts: list) -> dict:
     return dict(dict_of_lists)
 
 
-def _transpose_dict_of_lists(dict_of_lists: dict) -> list:
-    "Transform dict-of-lists (i.e. DataFrame-like) into list-of-dicts."
-    list_of_dicts = []
+def _iter_rows(dict_of_lists: dict) -> Iterator[dict]:
+    """
+    Lazily transform dict-of-lists (i.e. DataFrame-like) into dicts, row by row.
+
+    With no columns there is no way to know the number of rows, so a fresh
+    empty dict is yielded indefinitely; callers zip this against a column that
+    determines the length.
+    """
     keys = list(dict_of_lists)
+    if not keys:
+        while True:
+            yield {}
     for row in zip(*(dict_of_lists[k] for k in keys)):
-        list_of_dicts.append(dict(zip(keys, row)))
-    return list_of_dicts
+        yield dict(zip(keys, row))
+
+
+def _event_to_single_page(event: Event) -> EventPage:
+    "Transform one Event into an EventPage, like pack_event_page(event)."
+    event_page: EventPage = {
+        "time": [event["time"]],
+        "uid": [event["uid"]],
+        "seq_num": [event["seq_num"]],
+        "descriptor": event["descriptor"],
+        "filled": {k: [v] for k, v in event.get("filled", {}).items()},
+        "data": {k: [v] for k, v in event["data"].items()},
+        "timestamps": {k: [v] for k, v in event["timestamps"].items()},
+    }
+    return event_page
+
+
+def _single_page_to_event(event_page: EventPage) -> Event:
+    "Transform a one-row EventPage back into an Event."
+    # Like (event,) = unpack_event_page(event_page), raise ValueError unless
+    # there is exactly one row.
+    (uid,) = event_page["uid"]
+    event: Event = {
+        "descriptor": event_page["descriptor"],
+        "uid": uid,
+        "time": event_page["time"][0],
+        "seq_num": event_page["seq_num"][0],
+        "data": {k: v[0] for k, v in event_page["data"].items()},
+        "timestamps": {k: v[0] for k, v in event_page["timestamps"].items()},
+        "filled": {k: v[0] for k, v in event_page.get("filled", {}).items()},
+    }
+    return event
+
+
+def _datum_to_single_page(datum: Datum) -> DatumPage:
+    "Transform one Datum into a DatumPage, like pack_datum_page(datum)."
+    datum_page: DatumPage = {
+        "resource": datum["resource"],
+        "datum_id": [datum["datum_id"]],
+        "datum_kwargs": {k: [v] for k, v in datum["datum_kwargs"].items()},
+    }
+    return datum_page
+
+
+def _single_page_to_datum(datum_page: DatumPage) -> Datum:
+    "Transform a one-row DatumPage back into a Datum."
+    # Like (datum,) = unpack_datum_page(datum_page), raise ValueError unless
+    # there is exactly one row.
+    (datum_id,) = datum_page["datum_id"]
+    datum: Datum = {
+        "datum_id": datum_id,
+        "datum_kwargs": {k: v[0] for k, v in datum_page["datum_kwargs"].items()},
+        "resource": datum_page["resource"],
+    }
+    return datum
 
 
 def verify_filled(event_page: dict) -> None:
@@ -3054,17 +3482,16 @@ def verify_filled(event_page: dict) -> None:
         Raised if any of the data in the event_page is unfilled, when raised it
         inlcudes a list of unfilled data objects in the exception message.
     """
-    if not all(map(all, event_page["filled"].values())):
-        # check that all event_page data is filled.
-        unfilled_data = []
-        for field, filled in event_page["filled"].items():
-            if not all(filled):
-                unfilled_data.append(field)
-                raise UnfilledData(
-                    f"Unfilled data found in fields "
-                    f"{unfilled_data!r}. Use "
-                    f"`event_model.Filler`."
-                )
+    # A single pass over the columns; all() stops at the first unfilled row.
+    unfilled_data = [
+        field for field, filled in event_page["filled"].items() if not all(filled)
+    ]
+    if unfilled_data:
+        raise UnfilledData(
+            f"Unfilled data found in fields "
+            f"{unfilled_data!r}. Use "
+            f"`event_model.Filler`."
+        )
 
 
 def sanitize_doc(doc: dict) -> dict:
@@ -3086,7 +3513,89 @@ def sanitize_doc(doc: dict) -> dict:
         The event-model document with numpy objects converted to built-in
         Python types.
     """
-    return json.loads(json.dumps(doc, cls=NumpyEncoder))
+    return _sanitize(doc)
+
+
+# Types that json.loads can return as-is; these need no conversion.
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _sanitize(obj: Any) -> Any:
+    """
+    Return obj converted to what json.loads(json.dumps(obj, cls=NumpyEncoder))
+    would return, without the round-trip through a string.
+    """
+    if type(obj) in _JSON_SCALAR_TYPES:
+        return obj
+    if isinstance(obj, dict):
+        return {_sanitize_key(k): _sanitize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sanitize(v) for v in obj]
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, numpy.ndarray):
+        if obj.dtype.kind in "biuf":
+            # tolist() already yields built-in bool, int and float.
+            return obj.tolist()
+        return _sanitize(obj.tolist())
+    if isinstance(obj, numpy.generic):
+        return _sanitize(obj.item())
+    # Anything else (e.g. dask arrays) is handled or rejected by the encoder.
+    return _sanitize(NumpyEncoder().default(obj))
+
+
+def _sanitize_key(key: Any) -> str:
+    "Convert a dict key to a string the way json.dumps does."
+    if isinstance(key, str):
+        return str.__str__(key)
+    if isinstance(key, float):
+        if key != key:
+            return "NaN"
+        if key == float("inf"):
+            return "Infinity"
+        if key == -float("inf"):
+            return "-Infinity"
+        return float.__repr__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+# Map the exact numpy types NumpyEncoder sees most often to the method that
+# converts them to built-in Python types, so that the common cases are handled
+# by a single dict lookup on type(obj).
+_NUMPY_ENCODERS: Dict[type, Callable] = {numpy.ndarray: numpy.ndarray.tolist}
+for _numpy_type in (
+    numpy.bool_,
+    numpy.int8,
+    numpy.int16,
+    numpy.int32,
+    numpy.int64,
+    numpy.uint8,
+    numpy.uint16,
+    numpy.uint32,
+    numpy.uint64,
+    numpy.float16,
+    numpy.float32,
+    numpy.float64,
+    numpy.complex64,
+    numpy.complex128,
+    numpy.str_,
+    numpy.bytes_,
+):
+    _NUMPY_ENCODERS[_numpy_type] = numpy.generic.item
 
 
 class NumpyEncoder(json.JSONEncoder):
@@ -3104,13 +3613,14 @@ class NumpyEncoder(json.JSONEncoder):
     # Credit: https://stackoverflow.com/a/47626762/1221924
     @no_type_check
     def default(self, obj: object) -> Any:
-        try:
-            import dask.array
-
-            if isinstance(obj, dask.array.Array):
-                obj = numpy.asarray(obj)
-        except ImportError:
-            pass
+        encode = _NUMPY_ENCODERS.get(type(obj))
+        if encode is not None:
+            return encode(obj)
+        # An object can only be a dask array if dask.array has been imported,
+        # so check sys.modules rather than attempting the import on every call.
+        dask_array = sys.modules.get("dask.array")
+        if dask_array is not None and isinstance(obj, dask_array.Array):
+            obj = numpy.asarray(obj)
         if isinstance(obj, (numpy.generic, numpy.ndarray)):
             if numpy.isscalar(obj):
                 return obj.item()
@@ -1,96 +1,63 @@
 """
 A wrapper used to patch out schema generation utilities.
-"""
-
-from typing import TYPE_CHECKING, Any, Dict, List, Union
-
-pydantic_version = None
 
+The document modules only record their schema metadata here, so importing
+event-model never imports pydantic. ``typeddict_to_schema`` swaps these
+placeholders for their pydantic equivalents when a schema is generated.
+"""
 
-def Field(*args, **kwargs): ...
-
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-class BaseModel: ...
+from typing_extensions import Annotated
 
 
-class TypeAdapter:
-    def __init__(self, *args, **kwargs):
-        self.by_alias = True
-        ...
+@dataclass(frozen=True)
+class Field:
+    """Schema metadata for a field, converted to a ``pydantic.Field`` later."""
 
-    def json_schema(self, *args, **kwargs): ...
+    description: Optional[str] = None
+    pattern: Optional[str] = None
+    title: Optional[str] = None
 
 
-class GenerateJsonSchema: ...
+@dataclass(frozen=True)
+class AsRef:
+    """Marks a type to be generated as the named pydantic root model."""
 
+    __slots__ = ("ref_name",)
 
-def to_snake(*args, **kwargs): ...
+    ref_name: str
 
 
-DataFrameForDatumPage = List[str]
+if TYPE_CHECKING:
+    DataFrameForDatumPage = List[str]
 
-DataFrameForEventPage = Dict[str, List]
+    DataFrameForEventPage = Dict[str, List]
 
-DataFrameForFilled = Dict[str, List[Union[bool, str]]]
+    DataFrameForFilled = Dict[str, List[Union[bool, str]]]
 
+else:
+    DataFrameForDatumPage = Annotated[List[str], AsRef("DataFrameForDatumPage")]
 
-class DataType: ...
+    DataFrameForEventPage = Annotated[Dict[str, List], AsRef("DataFrameForEventPage")]
 
+    DataFrameForFilled = Annotated[
+        Dict[str, List[Union[bool, str]]], AsRef("DataFrameForFilled")
+    ]
 
-def add_extra_schema(*args, **kwargs):
-    def inner(cls):
-        return cls
 
-    return inner
+class DataType:
+    """Stands in for a (possibly nested) mapping of data, generated as a $def."""
 
 
 # Dictionary for patching in schema post generation
 extra_schema = {}  # type: ignore
 
-if not TYPE_CHECKING:
-    try:
-        import pydantic
-
-        if pydantic.__version__ < "2":
-            raise ImportError
-
-        pydantic_version = pydantic.__version__
 
-        # Root models for root definitions:
-        # we want some types to reference definitions in the
-        # schema
-        BaseModel = pydantic.BaseModel
-        ConfigDict = pydantic.ConfigDict
-        Field = pydantic.Field
-        RootModel = pydantic.RootModel
-        TypeAdapter = pydantic.TypeAdapter
-        GenerateJsonSchema = pydantic.json_schema.GenerateJsonSchema
-        from pydantic.alias_generators import to_snake  # noqa
-
-        class Config(ConfigDict): ...
-
-        class DataFrameForDatumPage(RootModel):
-            root: List[str] = Field(alias="Dataframe")
-
-        class DataFrameForEventPage(RootModel):
-            root: Dict[str, List] = Field(alias="Dataframe")
-
-        class DataFrameForFilled(RootModel):
-            root: Dict[str, List[Union[bool, str]]] = Field(alias="DataframeForFilled")
-
-        class DataType(RootModel):
-            root: Any = Field(alias="DataType")
-
-        def add_extra_schema(schema: Dict) -> Dict:
-            def inner(cls):
-                extra_schema[cls] = schema
-                return cls
-
-            return inner
+def add_extra_schema(schema: Dict):
+    def inner(cls):
+        extra_schema[cls] = schema
+        return cls
 
-    # If pydantic is not installed (e.g the install isn't [dev]),
-    # or pydantic v1 is being used, then we expect to be able to
-    # run event-model, just not the schema generation code.
-    except (ModuleNotFoundError, ImportError):
-        # None of the dummy functions/classes should have been overwritten.
-        assert pydantic_version is None
+    return inner
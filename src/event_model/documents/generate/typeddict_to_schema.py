@@ -1,15 +1,108 @@
 import json
 from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import Field, RootModel, TypeAdapter
+from pydantic.alias_generators import to_snake
+from pydantic.json_schema import GenerateJsonSchema
+from typing_extensions import (
+    Annotated,
+    NotRequired,
+    Required,
+    TypedDict,
+    get_args,
+    get_origin,
+    is_typeddict,
+)
 
 from event_model.documents import ALL_DOCUMENTS, DocumentType
-from event_model.documents.generate.type_wrapper import (
-    GenerateJsonSchema,
-    TypeAdapter,
-    extra_schema,
-    to_snake,
-)
+from event_model.documents.generate import type_wrapper
+from event_model.documents.generate.type_wrapper import extra_schema
+
+
+# Root models for root definitions:
+# we want some types to reference definitions in the
+# schema
+class DataFrameForDatumPage(RootModel):
+    root: List[str] = Field(alias="Dataframe")
+
+
+class DataFrameForEventPage(RootModel):
+    root: Dict[str, List] = Field(alias="Dataframe")
+
+
+class DataFrameForFilled(RootModel):
+    root: Dict[str, List[Union[bool, str]]] = Field(alias="DataframeForFilled")
+
+
+class DataType(RootModel):
+    root: Any = Field(alias="DataType")
+
+
+ROOT_MODELS = {
+    model.__name__: model
+    for model in (
+        DataFrameForDatumPage,
+        DataFrameForEventPage,
+        DataFrameForFilled,
+        DataType,
+    )
+}
+
+# TypedDicts already converted by to_pydantic, so that a type used by several
+# documents (e.g. DataKey) is only ever converted to one class.
+_pydantic_typeddicts: Dict[type, type] = {}
+
+
+def to_pydantic(annotation: Any) -> Any:
+    """
+    Swap the type_wrapper placeholders in an annotation for pydantic types.
+
+    The document modules are written against type_wrapper so that importing
+    them does not import pydantic. Here ``Field`` becomes ``pydantic.Field``,
+    ``AsRef`` and ``DataType`` become root models, and TypedDicts are rebuilt
+    from their converted annotations.
+    """
+    if annotation is type_wrapper.DataType:
+        return DataType
+    if is_typeddict(annotation):
+        if annotation not in _pydantic_typeddicts:
+            _pydantic_typeddicts[annotation] = _typeddict_to_pydantic(annotation)
+        return _pydantic_typeddicts[annotation]
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        inner, metadata = to_pydantic(args[0]), []
+        for item in args[1:]:
+            if isinstance(item, type_wrapper.AsRef):
+                inner = ROOT_MODELS[item.ref_name]
+            elif isinstance(item, type_wrapper.Field):
+                kwargs = {k: v for k, v in vars(item).items() if v is not None}
+                metadata.append(Field(**kwargs))
+            else:
+                metadata.append(item)
+        return Annotated[(inner, *metadata)] if metadata else inner
+    if origin in (NotRequired, Required):
+        return origin[to_pydantic(args[0])]
+    if not args:
+        return annotation
+    converted = tuple(to_pydantic(arg) for arg in args)
+    if all(new is old for new, old in zip(converted, args)):
+        return annotation
+    return annotation.copy_with(converted)
+
+
+def _typeddict_to_pydantic(typed_dict: Any) -> Any:
+    converted = TypedDict(  # type: ignore
+        typed_dict.__name__,
+        {key: to_pydantic(value) for key, value in typed_dict.__annotations__.items()},
+        total=typed_dict.__total__,
+    )
+    converted.__doc__ = typed_dict.__doc__
+    converted.__module__ = typed_dict.__module__
+    converted.__qualname__ = typed_dict.__qualname__
+    return converted
 
 
 def sort_alphabetically(schema: Dict) -> Dict:
@@ -112,9 +205,10 @@ def typeddict_to_schema(
 ) -> Dict:
     assert document_type in ALL_DOCUMENTS
 
-    type_adapter = TypeAdapter(document_type)
-    type_adapter.by_alias = True
-    document_schema = type_adapter.json_schema(schema_generator=_GenerateJsonSchema)
+    type_adapter = TypeAdapter(to_pydantic(document_type))
+    document_schema = type_adapter.json_schema(
+        by_alias=True, schema_generator=_GenerateJsonSchema
+    )
 
     if sort:
         document_schema = sort_schema(document_schema)
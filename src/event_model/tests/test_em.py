@@ -1,5 +1,11 @@
+import gc
 import json
 import pickle
+import random
+import uuid
+import warnings
+import weakref
+from unittest import mock
 
 import numpy
 import pytest
@@ -98,6 +104,42 @@ def test_compose_run():
     assert stop_doc["num_events"]["primary"] == 3
 
 
+def test_compose_event_validates_keys():
+    bundle = event_model.compose_run()
+    desc_bundle = bundle.compose_descriptor(
+        data_keys={"motor": {"shape": [], "dtype": "number", "source": "..."}},
+        name="primary",
+    )
+    with pytest.raises(event_model.EventModelValidationError):
+        desc_bundle.compose_event(data={"motor": 0}, timestamps={})
+    with pytest.raises(event_model.EventModelValidationError):
+        desc_bundle.compose_event(
+            data={"motor": 0}, timestamps={"motor": 0}, filled={"image": False}
+        )
+    with pytest.raises(event_model.EventModelValidationError):
+        desc_bundle.compose_event_page(
+            data={"motor": [0]}, timestamps={"motor": [0]}, filled={"image": [False]}
+        )
+    desc_bundle.compose_event_page(data={"motor": [0]}, timestamps={"motor": [0]})
+
+
+def test_default_uids_are_uuid4():
+    uids = {event_model._new_uid() for _ in range(1000)}
+    assert len(uids) == 1000
+    for uid in uids:
+        parsed = uuid.UUID(uid)
+        assert parsed.version == 4
+        assert parsed.variant == uuid.RFC_4122
+        assert str(parsed) == uid
+    start_doc = event_model.compose_run().start_doc
+    assert uuid.UUID(start_doc["uid"]).version == 4
+    # Seeding the global random state must not make uids repeat.
+    random.seed(0)
+    first = event_model._new_uid()
+    random.seed(0)
+    assert event_model._new_uid() != first
+
+
 def test_compose_stream_resource(tmp_path):
     """
     Following the example of test_compose_run, focus only on the stream resource and
@@ -311,6 +353,26 @@ def test_sanitize_doc():
     json.dumps(event_model.sanitize_doc(event1))
 
 
+def test_sanitize_doc_matches_json_round_trip():
+    doc = {
+        "a": numpy.int64(1),
+        "b": numpy.float32(1.5),
+        "c": numpy.bool_(True),
+        "d": numpy.arange(6).reshape(2, 3),
+        "e": (1, "two", numpy.float64(3.0)),
+        "f": {3: "int key", 2.5: "float key", None: "none key", True: "bool key"},
+        "g": numpy.array(["x", "y"]),
+        "h": [float("nan"), None, {"nested": numpy.zeros(2, dtype=bool)}],
+    }
+    expected = json.loads(json.dumps(doc, cls=event_model.NumpyEncoder))
+    actual = event_model.sanitize_doc(doc)
+    assert json.dumps(actual) == json.dumps(expected)
+    with pytest.raises(TypeError):
+        event_model.sanitize_doc({"a": object()})
+    with pytest.raises(TypeError):
+        event_model.sanitize_doc({(1, 2): "tuple key"})
+
+
 def test_bulk_datum_to_datum_page():
     run_bundle = event_model.compose_run()
     res_bundle = run_bundle.compose_resource(
@@ -329,6 +391,65 @@ def test_bulk_datum_to_datum_page():
     assert actual == expected
 
 
+def test_bulk_deprecation_warnings_issued_once():
+    class Router(event_model.DocumentRouter):
+        pass
+
+    run_bundle = event_model.compose_run()
+    res_bundle = run_bundle.compose_resource(
+        spec="TIFF", root="/tmp", resource_path="stack.tiff", resource_kwargs={}
+    )
+    datum = res_bundle.compose_datum(datum_kwargs={"slice": 5})
+    bulk_datum = {
+        "resource": res_bundle.resource_doc["uid"],
+        "datum_kwarg_list": [datum["datum_kwargs"]],
+        "datum_ids": [datum["datum_id"]],
+    }
+
+    class SubRouter(Router):
+        pass
+
+    # Under the default filter, the warnings registry shows each warning once.
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("default")
+        for router in (Router(), Router(), SubRouter()):
+            router("bulk_datum", bulk_datum)
+            router("bulk_events", {})
+    assert len(caught) == 2
+    assert "bulk_datum" in str(caught[0].message)
+    assert "bulk_events" in str(caught[1].message)
+    # Filters chosen by the user are respected, for every class.
+    for router in (Router(), SubRouter()):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with pytest.raises(UserWarning, match="bulk_datum"):
+                router("bulk_datum", bulk_datum)
+            with pytest.raises(UserWarning, match="bulk_events"):
+                router("bulk_events", {})
+
+
+def test_single_row_page_helpers_match_pack_and_unpack():
+    run_bundle = event_model.compose_run()
+    desc_bundle = run_bundle.compose_descriptor(
+        data_keys={"motor": {"shape": [], "dtype": "number", "source": "..."}},
+        name="primary",
+    )
+    event = desc_bundle.compose_event(
+        data={"motor": 0}, timestamps={"motor": 0}, filled={}, seq_num=1
+    )
+    event_page = event_model._event_to_single_page(event)
+    assert event_page == event_model.pack_event_page(event)
+    assert event_model._single_page_to_event(event_page) == event
+
+    res_bundle = run_bundle.compose_resource(
+        spec="TIFF", root="/tmp", resource_path="stack.tiff", resource_kwargs={}
+    )
+    datum = res_bundle.compose_datum(datum_kwargs={"slice": 5})
+    datum_page = event_model._datum_to_single_page(datum)
+    assert datum_page == event_model.pack_datum_page(datum)
+    assert event_model._single_page_to_datum(datum_page) == datum
+
+
 def test_document_router_smoke_test():
     dr = event_model.DocumentRouter()
     run_bundle = event_model.compose_run()
@@ -380,6 +501,152 @@ def test_document_router_smoke_test():
     dr("stop", run_bundle.compose_stop())
 
 
+def test_document_router_subclass_without_super_init():
+    class Router(event_model.DocumentRouter):
+        def __init__(self):
+            # Deliberately skip DocumentRouter.__init__.
+            self.starts = []
+
+        def start(self, doc):
+            self.starts.append(doc)
+
+    router = Router()
+    start_doc = event_model.compose_run().start_doc
+    assert router("start", start_doc) == ("start", start_doc)
+    assert router("start", start_doc) == ("start", start_doc)
+    assert router.starts == [start_doc, start_doc]
+    with pytest.raises(AttributeError):
+        router("not_a_document", {})
+
+
+def test_document_router_skips_unimplemented_default_methods():
+    calls = []
+
+    class Router(event_model.DocumentRouter):
+        def event(self, doc):
+            calls.append("subclass event")
+            return super().event(doc)
+
+        def event_page(self, doc):
+            calls.append("event_page")
+
+    run_bundle = event_model.compose_run()
+    desc_bundle = run_bundle.compose_descriptor(
+        data_keys={"motor": {"shape": [], "dtype": "number", "source": "..."}},
+        name="primary",
+    )
+    event = desc_bundle.compose_event(
+        data={"motor": 0}, timestamps={"motor": 0}, seq_num=1
+    )
+    router = Router()
+    # The subclass' event returns NotImplemented, so event_page is used.
+    assert router("event", event) == ("event", event)
+    assert calls == ["subclass event", "event_page"]
+    datum = run_bundle.compose_resource(
+        spec="TIFF", root="/tmp", resource_path="stack.tiff", resource_kwargs={}
+    ).compose_datum(datum_kwargs={})
+    assert router("datum", datum) == ("datum", datum)
+    # Documents with no fallback are passed through.
+    assert router("start", run_bundle.start_doc) == ("start", run_bundle.start_doc)
+    # Dispatching leaves no reference from the router to itself.
+    ref = weakref.ref(router)
+    gc.disable()
+    try:
+        del router
+        assert ref() is None
+    finally:
+        gc.enable()
+
+
+def test_document_router_rejects_pages_without_exactly_one_row():
+    run_bundle = event_model.compose_run()
+    desc_bundle = run_bundle.compose_descriptor(
+        data_keys={"motor": {"shape": [], "dtype": "number", "source": "..."}},
+        name="primary",
+    )
+    events = [
+        desc_bundle.compose_event(data={"motor": i}, timestamps={"motor": 0})
+        for i in range(2)
+    ]
+    res_bundle = run_bundle.compose_resource(
+        spec="TIFF", root="/tmp", resource_path="stack.tiff", resource_kwargs={}
+    )
+    datums = [res_bundle.compose_datum(datum_kwargs={"slice": i}) for i in range(2)]
+
+    class Router(event_model.DocumentRouter):
+        # Return a page with a different number of rows than was passed in.
+        def event_page(self, doc):
+            return self.page
+
+        def datum_page(self, doc):
+            return self.page
+
+    router = Router()
+    router.page = event_model.pack_event_page(*events)
+    with pytest.raises(ValueError):
+        router("event", events[0])
+    router.page = {
+        "descriptor": desc_bundle.descriptor_doc["uid"],
+        "uid": [],
+        "time": [],
+        "seq_num": [],
+        "data": {"motor": []},
+        "timestamps": {"motor": []},
+        "filled": {},
+    }
+    with pytest.raises(ValueError):
+        router("event", events[0])
+    router.page = event_model.pack_datum_page(*datums)
+    with pytest.raises(ValueError):
+        router("datum", datums[0])
+    router.page = {
+        "resource": res_bundle.resource_doc["uid"],
+        "datum_id": [],
+        "datum_kwargs": {"slice": []},
+    }
+    with pytest.raises(ValueError):
+        router("datum", datums[0])
+
+
+def test_document_router_dispatches_to_instance_attributes():
+    calls = []
+
+    class Router(event_model.DocumentRouter):
+        pass
+
+    run_bundle = event_model.compose_run()
+    router = Router()
+    assert router("start", run_bundle.start_doc) == ("start", run_bundle.start_doc)
+    # A handler set on the instance after the first dispatch is used.
+    router.start = lambda doc: calls.append(doc) or {"replaced": True}
+    assert router("start", run_bundle.start_doc) == ("start", {"replaced": True})
+    assert calls == [run_bundle.start_doc]
+    # Other instances of the class are unaffected.
+    assert Router()("start", run_bundle.start_doc) == (
+        "start",
+        run_bundle.start_doc,
+    )
+
+
+def test_document_router_dispatches_to_patched_methods():
+    class Router(event_model.DocumentRouter):
+        def stop(self, doc):
+            return {"patched": False}
+
+    run_bundle = event_model.compose_run()
+    stop_doc = run_bundle.compose_stop()
+    router = Router()
+    assert router("stop", stop_doc) == ("stop", {"patched": False})
+    with mock.patch.object(Router, "stop", return_value={"patched": True}):
+        assert router("stop", stop_doc) == ("stop", {"patched": True})
+    assert router("stop", stop_doc) == ("stop", {"patched": False})
+    # Patching a default method of DocumentRouter itself is respected too.
+    with mock.patch.object(
+        event_model.DocumentRouter, "start", return_value={"patched": True}
+    ):
+        assert router("start", run_bundle.start_doc) == ("start", {"patched": True})
+
+
 def test_document_router_streams_smoke_test(tmp_path):
     dr = event_model.DocumentRouter()
     run_bundle = event_model.compose_run()
@@ -864,6 +1131,37 @@ def test_rechunk_event_pages(filled):
     assert event_pages == list(event_pages_13)
 
 
+def test_rechunk_event_pages_without_filled():
+    event_page = {
+        "descriptor": "DESCRIPTOR",
+        "seq_num": [1, 2, 3],
+        "time": [1, 2, 3],
+        "uid": ["a", "b", "c"],
+        "data": {"x": [1, 2, 3]},
+        "timestamps": {"x": [1, 2, 3]},
+    }
+    pages = list(event_model.rechunk_event_pages([event_page], 2))
+    assert [page["uid"] for page in pages] == [["a", "b"], ["c"]]
+    assert all(page["filled"] == {} for page in pages)
+
+
+def test_merge_event_pages_keys_each_column_by_its_own_keys():
+    def event_page(uid):
+        return {
+            "descriptor": "DESCRIPTOR",
+            "seq_num": [1],
+            "time": [1],
+            "uid": [uid],
+            "data": {"x": [1], "y": [2]},
+            "timestamps": {"x": [1]},
+        }
+
+    merged = event_model.merge_event_pages([event_page("a"), event_page("b")])
+    assert merged["data"] == {"x": [1, 1], "y": [2, 2]}
+    assert merged["timestamps"] == {"x": [1, 1]}
+    assert merged["filled"] == {}
+
+
 def test_rechunk_datum_pages():
     def datum_page_gen(page_size, num_pages):
         """
@@ -949,6 +1247,21 @@ def test_attempt_with_retires():
         )
 
 
+def test_attempt_with_retries_skips_zero_sleep(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(event_model.ttime, "sleep", sleeps.append)
+    result = event_model._attempt_with_retries(
+        func=lambda: 10,
+        args=(),
+        kwargs={},
+        error_to_catch=OSError,
+        error_to_raise=event_model.EventModelError,
+        intervals=[0],
+    )
+    assert result == 10
+    assert sleeps == []
+
+
 def test_round_trip_event_page_with_empty_data():
     event_page = {
         "time": [1, 2, 3],
@@ -965,6 +1278,10 @@ def test_round_trip_event_page_with_empty_data():
     page_again = event_model.pack_event_page(*events)
     assert page_again == event_page
 
+    # Each Event gets its own dicts, even when the page has no columns.
+    assert len({id(event["filled"]) for event in events}) == 3
+    assert len({id(event["data"]) for event in events}) == 3
+
 
 def test_round_trip_datum_page_with_empty_data():
     datum_page = {"datum_id": ["a", "b", "c"], "resource": "d", "datum_kwargs": {}}
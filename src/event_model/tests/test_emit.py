@@ -48,6 +48,34 @@ def test_emit_with_method():
     assert len(collector) == 1
 
 
+def test_emit_strong_reference():
+    collector = []
+
+    def cb(name, doc):
+        collector.append((name, doc))
+
+    router = event_model.DocumentRouter(emit=cb, weak=False)
+    name = "start"
+    doc = {"uid": "asdf", "time": 0}
+    router.emit(name, doc)
+    assert collector == [(name, doc)]
+
+    # Test that we hold a strong reference.
+    del cb
+    gc.collect()
+    router.emit(name, doc)
+    assert len(collector) == 2
+
+    # A subclass' own emit method is not shadowed.
+    class Router(event_model.DocumentRouter):
+        def emit(self, name, doc):
+            collector.append("subclass")
+            super().emit(name, doc)
+
+    Router(emit=lambda name, doc: collector.append(name), weak=False).emit(name, doc)
+    assert collector[-2:] == ["subclass", name]
+
+
 def test_emit_validation():
     """
     Anything but a callable that accepts two arguments should raise ValueError.
@@ -88,6 +88,29 @@ def test_no_filler():
     filler("stop", stop_doc)
 
 
+def test_no_filler_event_page():
+    "Test that NoFiller validates an EventPage without filling it."
+    filler = event_model.NoFiller(reg)
+    filler("start", run_bundle.start_doc)
+    filler("descriptor", desc_bundle.descriptor_doc)
+    filler("resource", res_bundle.resource_doc)
+    filler("datum", datum_doc)
+    event_page = event_model.pack_event_page(copy.deepcopy(raw_event))
+    name, doc = filler("event_page", event_page)
+    assert doc["data"]["image"] == [datum_doc["datum_id"]]
+    assert doc["filled"]["image"] == [False]
+    # Excluded fields are not checked; included ones must resolve.
+    bad_page = copy.deepcopy(event_page)
+    bad_page["data"]["image"] = ["unknown"]
+    filler.fill_event_page(bad_page, exclude=["image"])
+    with pytest.raises(event_model.UnresolvableForeignKeyError):
+        filler("event_page", bad_page)
+    # Like Filler, a page without 'filled' has nothing to check.
+    del bad_page["filled"]
+    name, doc = filler("event_page", bad_page)
+    assert doc["data"]["image"] == ["unknown"]
+
+
 def test_get_handler(filler):
     "Test the method get_handler() which should always return a fresh instance."
     handler = filler.get_handler(res_bundle.resource_doc)
@@ -239,6 +262,12 @@ def test_verify_filled(filler):
     event_model.verify_filled(event_model.pack_event_page(event))
 
 
+def test_verify_filled_reports_every_unfilled_field():
+    page = {"filled": {"a": [True, False], "b": [True, True], "c": [False]}}
+    with pytest.raises(event_model.UnfilledData, match=r"\['a', 'c'\]"):
+        event_model.verify_filled(page)
+
+
 def test_inplace():
     "Test the behavior of the 'inplace' parameter."
     with event_model.Filler(reg, inplace=True) as filler:
@@ -330,6 +359,10 @@ def test_handler_registry_access():
             return numpy.ones((5, 5))
 
     with event_model.Filler(reg, inplace=False) as filler:
+        # Read access behaves like a dict.
+        assert "DUMMY" in filler.handler_registry
+        assert list(filler.handler_registry) == ["DUMMY"]
+        assert filler.handler_registry.get("SOMETHING_ELSE") is None
         with pytest.raises(event_model.EventModelTypeError):
             # Updating an existing key fails.
             filler.handler_registry["DUMMY"] = OtherDummyHandler
@@ -409,3 +442,184 @@ def test_clear_caches(filler):
     assert filler._handler_cache  # implementation detail
     filler.clear_handler_cache()
     assert not filler._handler_cache  # implementation detail
+
+
+def test_fill_event_page_matches_fill_event():
+    "Test that filling a page agrees with filling its Events one by one."
+    with event_model.Filler(reg, inplace=False) as filler:
+        filler("start", run_bundle.start_doc)
+        filler("descriptor", desc_bundle.descriptor_doc)
+        filler("resource", res_bundle.resource_doc)
+        filler("datum", datum_doc)
+        events = [
+            desc_bundle.compose_event(
+                data={"motor": i, "image": datum_doc["datum_id"]},
+                timestamps={"motor": 0, "image": 0},
+                filled={"image": False},
+                seq_num=i,
+            )
+            for i in range(1, 4)
+        ]
+        event_page = event_model.pack_event_page(*events)
+        original = copy.deepcopy(event_page)
+        filled_page = filler.fill_event_page(event_page)
+        # The original page is untouched.
+        assert event_page == original
+        assert filled_page["filled"]["image"] == [datum_doc["datum_id"]] * 3
+        assert filled_page["data"]["motor"] == [1, 2, 3]
+        for event, filled_event in zip(
+            events, event_model.unpack_event_page(filled_page)
+        ):
+            expected = filler.fill_event(event)
+            assert filled_event["uid"] == expected["uid"]
+            assert filled_event["filled"] == expected["filled"]
+            numpy.testing.assert_array_equal(
+                filled_event["data"]["image"], expected["data"]["image"]
+            )
+        # Excluded keys are left as they were.
+        excluded_page = filler.fill_event_page(event_page, exclude=["image"])
+        assert excluded_page["data"] == event_page["data"]
+        assert excluded_page["filled"] == event_page["filled"]
+
+
+def test_fill_event_page_applies_coercion():
+    "Test that filling an EventPage goes through the coerced handler per row."
+
+    class ListHandler(DummyHandler):
+        def __call__(self, c, d):
+            return [[1, 2], [3, 4]]
+
+    with event_model.Filler(
+        {"DUMMY": ListHandler}, inplace=False, coerce="force_numpy"
+    ) as filler:
+        filler("start", run_bundle.start_doc)
+        filler("descriptor", desc_bundle.descriptor_doc)
+        filler("resource", res_bundle.resource_doc)
+        datums = [res_bundle.compose_datum(datum_kwargs={"c": 3, "d": 4})]
+        datums.append(res_bundle.compose_datum(datum_kwargs={"c": 3, "d": 4}))
+        for datum in datums:
+            filler("datum", datum)
+        events = [
+            desc_bundle.compose_event(
+                data={"motor": i, "image": datum["datum_id"]},
+                timestamps={"motor": 0, "image": 0},
+                filled={"image": False},
+                seq_num=i,
+            )
+            for i, datum in enumerate(datums, start=1)
+        ]
+        filled_page = filler.fill_event_page(event_model.pack_event_page(*events))
+        assert filled_page["filled"]["image"] == [d["datum_id"] for d in datums]
+        for image in filled_page["data"]["image"]:
+            assert isinstance(image, numpy.ndarray)
+            assert image.shape == (2, 2)
+
+
+def test_datum_page_caches_each_datum():
+    "Test that datum_page caches the same documents as unpack_datum_page."
+    datums = [res_bundle.compose_datum(datum_kwargs={"c": 3, "d": i}) for i in range(3)]
+    datum_page = event_model.pack_datum_page(*datums)
+    with event_model.Filler(reg, inplace=False) as filler:
+        filler("datum_page", datum_page)
+        assert filler._datum_cache == {d["datum_id"]: d for d in datums}
+
+
+def test_get_handler_error_message():
+    "Test the error raised when a handler cannot be instantiated."
+
+    def unavailable_handler(resource_path, **resource_kwargs):
+        raise OSError("not there yet")
+
+    with event_model.Filler(
+        {"DUMMY": unavailable_handler}, inplace=False, retry_intervals=[]
+    ) as filler:
+        with pytest.raises(event_model.EventModelError, match="not\\* modified") as e:
+            filler.get_handler(res_bundle.resource_doc)
+        assert isinstance(e.value.__cause__, OSError)
+
+
+def test_data_not_accessible_error_message():
+    "Test the error raised when a handler cannot load the data."
+
+    class UnreadableHandler(DummyHandler):
+        def __call__(self, c, d):
+            raise OSError("not there yet")
+
+    with event_model.Filler(
+        {"DUMMY": UnreadableHandler}, inplace=False, retry_intervals=[]
+    ) as filler:
+        filler("start", run_bundle.start_doc)
+        filler("descriptor", desc_bundle.descriptor_doc)
+        filler("resource", res_bundle.resource_doc)
+        filler("datum", datum_doc)
+        with pytest.raises(event_model.DataNotAccessible) as e:
+            filler("event", copy.deepcopy(raw_event))
+        assert datum_doc["datum_id"] in str(e.value)
+        assert isinstance(e.value.__cause__, OSError)
+        with pytest.raises(event_model.DataNotAccessible) as e:
+            filler("event_page", event_model.pack_event_page(raw_event))
+        assert datum_doc["datum_id"] in str(e.value)
+
+
+def test_fill_event_copy_leaves_original_untouched():
+    "Test that fill_event(inplace=False) does not modify the original Event."
+    with event_model.Filler(reg, inplace=False) as filler:
+        filler("start", run_bundle.start_doc)
+        filler("descriptor", desc_bundle.descriptor_doc)
+        filler("resource", res_bundle.resource_doc)
+        filler("datum", datum_doc)
+        event = copy.deepcopy(raw_event)
+        filled_event = filler.fill_event(event)
+        assert event == raw_event
+        assert filled_event["filled"]["image"] == datum_doc["datum_id"]
+        assert filled_event["data"]["image"].shape == (5, 5)
+        assert filled_event["timestamps"] == event["timestamps"]
+        assert filled_event["timestamps"] is not event["timestamps"]
+
+
+def test_fill_event_without_filled():
+    "Test that external keys are inferred from the descriptor if need be."
+    with event_model.Filler(reg, inplace=False) as filler:
+        filler("start", run_bundle.start_doc)
+        filler("descriptor", desc_bundle.descriptor_doc)
+        filler("resource", res_bundle.resource_doc)
+        filler("datum", datum_doc)
+        for _ in range(2):
+            event = copy.deepcopy(raw_event)
+            del event["filled"]
+            needs_filling, from_datakeys = filler._needs_filling(
+                event, desc_bundle.descriptor_doc, None, None
+            )
+            assert needs_filling == {"image"}
+            assert from_datakeys
+        assert filler._external_keys == {
+            desc_bundle.descriptor_doc["uid"]: (
+                desc_bundle.descriptor_doc,
+                frozenset({"image"}),
+            )
+        }
+        filler.clear_document_caches()
+        assert not filler._external_keys
+
+
+def test_fill_event_without_filled_after_descriptor_changes():
+    "Test that the inferred external keys follow a replaced descriptor."
+    internal_descriptor = copy.deepcopy(desc_bundle.descriptor_doc)
+    del internal_descriptor["data_keys"]["image"]["external"]
+    uid = internal_descriptor["uid"]
+    event = copy.deepcopy(raw_event)
+    del event["filled"]
+    with event_model.Filler(reg, inplace=False) as filler:
+
+        def needs_filling():
+            descriptor = filler._descriptor_cache[uid]
+            return filler._needs_filling(event, descriptor, None, None)[0]
+
+        filler("descriptor", desc_bundle.descriptor_doc)
+        assert needs_filling() == {"image"}
+        # Register a descriptor with the same uid but no external keys.
+        filler("descriptor", internal_descriptor)
+        assert needs_filling() == set()
+        # Put the original descriptor back into the cache directly.
+        filler._descriptor_cache[uid] = desc_bundle.descriptor_doc
+        assert needs_filling() == {"image"}
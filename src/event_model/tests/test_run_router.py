@@ -356,3 +356,56 @@ def test_subfactory_callback_exception():
 
     event_document = {"descriptor": "ghijkl", "uid": "mnopqr"}
     rr.event(event_document)
+
+
+def test_run_router_callback_order():
+    "Factory callbacks receive each document before subfactory callbacks."
+    run_bundle = event_model.compose_run()
+    desc_bundle = run_bundle.compose_descriptor(
+        data_keys={"motor": {"shape": [], "dtype": "number", "source": "..."}},
+        name="primary",
+    )
+    event_page = desc_bundle.compose_event_page(
+        data={"motor": [0]}, timestamps={"motor": [0]}, seq_num=[1]
+    )
+    received = []
+
+    def factory(name, doc):
+        def subfactory(name, doc):
+            return [lambda name, doc: received.append(("sub", name))]
+
+        return [lambda name, doc: received.append(("factory", name))], [subfactory]
+
+    rr = event_model.RunRouter([factory])
+    rr("start", run_bundle.start_doc)
+    rr("descriptor", desc_bundle.descriptor_doc)
+    received.clear()
+    rr("event_page", event_page)
+    rr("stop", run_bundle.compose_stop())
+    assert received == [
+        ("factory", "event_page"),
+        ("sub", "event_page"),
+        ("factory", "stop"),
+        ("sub", "stop"),
+    ]
+    assert not rr._cbs_by_start
+    assert not rr._cbs_by_descriptor
+
+
+def test_run_router_unlabeled_resources_are_bounded(monkeypatch):
+    monkeypatch.setattr(event_model, "_UNLABELED_RESOURCES_MAXLEN", 2)
+    run_bundle = event_model.compose_run()
+    rr = event_model.RunRouter([])
+    rr("start", run_bundle.start_doc)
+    resources = []
+    for _ in range(3):
+        resource = run_bundle.compose_resource(
+            spec="TIFF", root="/tmp", resource_path="stack.tiff", resource_kwargs={}
+        ).resource_doc
+        del resource["run_start"]
+        rr("resource", resource)
+        resources.append(resource)
+    assert list(rr._unlabeled_resources) == [r["uid"] for r in resources[1:]]
+    datum_page = {"resource": resources[0]["uid"], "datum_id": [], "datum_kwargs": {}}
+    with pytest.raises(event_model.UnresolvableForeignKeyError):
+        rr("datum_page", datum_page)
@@ -3,6 +3,8 @@
 # Test schema generation
 import json
 import os
+import subprocess
+import sys
 
 import pytest
 
@@ -30,3 +32,15 @@ def test_generated_json_matches_typed_dict(typed_dict_class, tmpdir):
                 "to run `python event_model/documents/generate` after changes "
                 f"to `{typed_dict_class.__name__}`?"
             ) from error
+
+
+def test_import_does_not_import_pydantic():
+    # pydantic is only needed to generate the schemas, not to use the documents.
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, event_model; assert 'pydantic' not in sys.modules",
+        ],
+        check=True,
+    )